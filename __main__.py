@@ -31,8 +31,7 @@ directory_path = os.path.abspath(directory)
 
 context = Context(name="Application of the Fourier Transform.", fullscreen=False)
 fourier = VisualFourier(context, image=image_path, directory=directory_path)
-# Load fourier coefficients if some already exist
-if fourier.filename in os.listdir(fourier.directory):
-    fourier.load()
+# Load fourier coefficients if some were already computed for this image
+fourier.loadCache()
 fourier()
 fourier.save()
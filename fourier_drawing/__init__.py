@@ -1 +1,13 @@
-from .fourier import *
+import importlib
+import importlib.util
+
+
+def __getattr__(name):
+    """Import the application lazily, so that the modules that do not rely on
+    pygame can be used without loading it."""
+    if name.startswith("__"):
+        raise AttributeError(name)
+    if importlib.util.find_spec("." + name, __name__) is not None:
+        return importlib.import_module("." + name, __name__)
+    fourier = importlib.import_module(".fourier", __name__)
+    return getattr(fourier, name)
@@ -0,0 +1,161 @@
+from .contours import ContourExtractor
+from .transform import Fourier
+from .tour import TourBuilder
+from .storage import saveComponents
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import glob
+import time
+import os
+
+extensions = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class BatchFourier:
+    """Compute the fourier coefficients of many images without any window, by
+    extracting their contours, ordering them into a single tour and
+    transforming this tour as a polygon, in a pool of processes."""
+
+    def __init__(
+        self,
+        directory="FourierObjects",
+        coefficients_number=201,
+        display_number=1000,
+        improvement_time=1,
+        extractor=None,
+        workers=None,
+        force=False,
+    ):
+        """Create a batch using the directory of the coefficients files, the
+        number of coefficients, the number of points of the display graph, the
+        duration of the improvement of the tours, the contour extractor, the
+        number of processes and whether up to date files are computed again."""
+        if extractor is None:
+            extractor = ContourExtractor()
+        self.directory = directory
+        self.coefficients_number = coefficients_number
+        self.display_number = display_number
+        self.improvement_time = improvement_time
+        self.extractor = extractor
+        self.workers = workers
+        self.force = force
+
+    def __call__(self, images):
+        """Compute the coefficients of the images and print the timings.
+        Return the paths of the coefficients files."""
+        paths = self.getPaths(images)
+        os.makedirs(self.directory, exist_ok=True)
+        jobs = {}
+        with ProcessPoolExecutor(self.workers) as executor:
+            for image, path in zip(images, paths):
+                if not self.force and self.isUpToDate(image, path):
+                    print(f"{image}: up to date")
+                    continue
+                jobs[executor.submit(self.compute, image, path)] = image
+            for job in as_completed(jobs):
+                image = jobs[job]
+                try:
+                    timings = job.result()
+                except Exception as error:
+                    print(f"{image}: failed ({error})")
+                    continue
+                print(
+                    f"{image}: "
+                    + ", ".join(f"{k} {v:.3f}s" for k, v in timings.items())
+                )
+        return paths
+
+    def getPath(self, image):
+        """Return the path of the coefficients file of the image, named after
+        the image with its extension, so that 'a.jpg' is saved in 'a_jpg'."""
+        name, extension = os.path.splitext(os.path.basename(image))
+        return os.path.join(self.directory, name + extension.replace(".", "_"))
+
+    def getPaths(self, images):
+        """Return the paths of the coefficients files of the images, which
+        must all be different so that no file overwrites another."""
+        paths = {}
+        for image in images:
+            path = self.getPath(image)
+            if path in paths:
+                raise ValueError(
+                    f"{paths[path]} and {image} would both be saved in {path}."
+                )
+            paths[path] = image
+        return list(paths)
+
+    def isUpToDate(self, image, path):
+        """Determine if the coefficients file is newer than the image."""
+        return os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(image)
+
+    def compute(self, image, path):
+        """Compute and save the coefficients of the image.
+        Return the durations of each stage."""
+        timings = {}
+        t = time.perf_counter()
+        contours = self.extractor(image)
+        if not contours:
+            raise ValueError("no contour was found")
+        timings["extraction"] = time.perf_counter() - t
+        t = time.perf_counter()
+        drawing = TourBuilder(self.improvement_time)(contours)
+        timings["ordering"] = time.perf_counter() - t
+        t = time.perf_counter()
+        coefficients = Fourier.polygonTransform(drawing, self.coefficients_number)
+        display = Fourier.inverseTransform(coefficients, self.display_number)
+        timings["transform"] = time.perf_counter() - t
+        t = time.perf_counter()
+        # Same content as the files saved by the VisualFourier
+        dictionary = {
+            "coefficients": coefficients,
+            "drawing": drawing,
+            "construction": [],
+            "display": display,
+        }
+        saveComponents(path, dictionary)
+        timings["saving"] = time.perf_counter() - t
+        return timings
+
+
+def findImages(sources):
+    """Return the images of the directories, globs or files given."""
+    images = []
+    for source in sources:
+        if os.path.isdir(source):
+            paths = sorted(glob.glob(os.path.join(source, "*")))
+        else:
+            paths = sorted(glob.glob(source))
+        images += [p for p in paths if p.lower().endswith(extensions)]
+    return images
+
+
+def main(args=None):
+    """Compute the coefficients of the images given in the command line."""
+    parser = argparse.ArgumentParser(
+        description="Compute the fourier coefficients of images without any window."
+    )
+    parser.add_argument("sources", nargs="+", help="directories, globs or images")
+    parser.add_argument("-o", "--directory", default="FourierObjects")
+    parser.add_argument("-n", "--coefficients", type=int, default=201)
+    parser.add_argument("-d", "--display", type=int, default=1000)
+    parser.add_argument("-t", "--improvement-time", type=float, default=1)
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("-f", "--force", action="store_true")
+    args = parser.parse_args(args)
+    batch = BatchFourier(
+        args.directory,
+        args.coefficients,
+        args.display,
+        args.improvement_time,
+        workers=args.workers,
+        force=args.force,
+    )
+    t = time.perf_counter()
+    images = findImages(args.sources)
+    batch(images)
+    print(f"{len(images)} images in {time.perf_counter() - t:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+from collections import OrderedDict
+from .coefficients import CoefficientSet
+from .storage import ComponentsFile, Components, saveComponents
+
+import numpy as np
+import hashlib
+import struct
+import copy
+import os
+
+
+class CoefficientCache:
+    """Cache of the fourier components stored in a directory, whose files are
+    named by a hash of the input and of the parameters of the transform, so
+    that different inputs never collide. The least recently used files are
+    removed when the directory is too large, and the most recently used
+    entries are also kept in memory.
+    The entries are either coefficient sets or the components of a
+    VisualFourier, stored as components files."""
+
+    @staticmethod
+    def key(data, **parameters):
+        """Return the key of the data, which is either the path of a file, an
+        array or a list of points, computed with the given parameters."""
+        h = hashlib.sha256()
+        if isinstance(data, (str, os.PathLike)):
+            with open(data, "rb") as f:
+                for chunk in iter(lambda: f.read(2 ** 20), b""):
+                    h.update(chunk)
+        else:
+            h.update(np.ascontiguousarray(data, dtype=float).tobytes())
+        h.update(repr(sorted(parameters.items())).encode())
+        return h.hexdigest()
+
+    def __init__(self, directory, max_size=2 ** 28, max_entries=256, memory_entries=8):
+        """Create a cache in the directory using the maximum size in bytes and
+        number of files of the directory and the number of entries in memory."""
+        self.directory = directory
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        """Determine if the key is in the cache."""
+        return key in self.memory or os.path.exists(self.getPath(key))
+
+    def getPath(self, key):
+        """Return the path of the file of the key."""
+        return os.path.join(self.directory, key)
+
+    def get(self, key, default=None):
+        """Return the entry of the key, or the default if it is not cached."""
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(self.memory[key])
+        path = self.getPath(key)
+        try:
+            value = self.read(path)
+        except (OSError, ValueError, KeyError, struct.error):
+            # The legacy pickled entries are not read but computed again
+            self.misses += 1
+            return default
+        os.utime(path)  # The modification time is used as the time of the last use
+        self.hits += 1
+        self.remember(key, value)
+        return value
+
+    def put(self, key, value):
+        """Store the entry of the key in memory and in the directory."""
+        self.remember(key, value)
+        os.makedirs(self.directory, exist_ok=True)
+        self.write(self.getPath(key), value)
+        self.evict()
+
+    def read(self, path):
+        """Return the entry of the file, a coefficient set or the components."""
+        file = ComponentsFile(path)
+        if "drawing" in file:
+            return Components(file)
+        return CoefficientSet(file["frequencies"], file["coefficients"])
+
+    def write(self, path, value):
+        """Write the entry, a coefficient set or the components, in the file.
+        The construction of the components is not stored."""
+        if isinstance(value, CoefficientSet):
+            sections = {
+                "frequencies": value.frequencies.astype(np.int64),
+                "coefficients": value.coefficients,
+            }
+            ComponentsFile.write(path, sections)
+        else:
+            saveComponents(path, value)
+
+    def remember(self, key, value):
+        """Store a copy of the entry of the key in memory, so that the changes
+        of the entries given or returned do not change the cache."""
+        self.memory[key] = copy.deepcopy(value)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def evict(self):
+        """Remove the least recently used files until the directory is small enough."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        size = sum(e[1] for e in entries)
+        while entries and (size > self.max_size or len(entries) > self.max_entries):
+            _, file_size, path = entries.pop(0)
+            os.remove(path)
+            size -= file_size
+
+    def clear(self):
+        """Remove all the entries of the cache."""
+        self.memory.clear()
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.is_file():
+                    os.remove(entry.path)
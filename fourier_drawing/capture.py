@@ -0,0 +1,68 @@
+import threading
+import time
+import cv2
+
+
+class CaptureSource:
+    """Read the frames of a camera or of a video file in a background thread,
+    keeping only the latest frame, so that showing the capture never waits
+    for the device."""
+
+    def __init__(self, source=0, loop=True):
+        """Create a capture source using the index of the camera or the path of
+        a video file, which is played at its frame rate and looped if loop is True."""
+        self.source = source
+        self.loop = loop
+        self.capture = cv2.VideoCapture(source)
+        self.is_file = isinstance(source, str)
+        self.period = 0
+        if self.is_file:
+            framerate = self.capture.get(cv2.CAP_PROP_FPS)
+            if framerate > 0:
+                self.period = 1 / framerate
+        self.lock = threading.Lock()
+        self.frame = None
+        self.count = 0  # Number of frames read, which identifies the latest one
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """Read the frames until the source is released or ended."""
+        next_time = time.perf_counter()
+        while self.running:
+            read, frame = self.capture.read()
+            if not read:
+                if self.is_file and self.loop and self.count:
+                    self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    continue
+                break
+            with self.lock:
+                self.frame = frame
+                self.count += 1
+            if self.period:
+                # The video files are read at their frame rate, not as fast as possible
+                next_time += self.period
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_time = time.perf_counter()
+        self.running = False
+
+    def read(self):
+        """Return the number of frames read and the latest frame, which is None
+        if no frame was read yet. The frame must not be modified."""
+        with self.lock:
+            return self.count, self.frame
+
+    def isOpened(self):
+        """Determine if the source is still read."""
+        return self.running
+
+    def release(self):
+        """Stop reading and release the source."""
+        self.running = False
+        if self.thread is not threading.current_thread():
+            self.thread.join()
+        self.capture.release()
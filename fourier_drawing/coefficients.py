@@ -0,0 +1,134 @@
+from collections.abc import Mapping
+
+import numpy as np
+import operator
+
+
+class CoefficientSet(Mapping):
+    """Fourier coefficients stored in a complex array, indexed by an array of
+    frequencies sorted in increasing order.
+    It behaves like the dictionary {frequency: coefficient} it replaces."""
+
+    @classmethod
+    def create(cls, cfs):
+        """Return a coefficient set from a coefficient set or a dictionary.
+        An empty value, such as the empty list of the legacy files, gives an
+        empty coefficient set."""
+        if isinstance(cfs, cls):
+            return cfs
+        if isinstance(cfs, Mapping):
+            return cls.createFromDict(cfs)
+        if cfs is None or len(cfs) == 0:
+            return cls()
+        raise TypeError("The coefficients must be a dictionary, not " + type(cfs).__name__)
+
+    @classmethod
+    def createFromDict(cls, cfs):
+        """Create a coefficient set from a dictionary {frequency: coefficient}."""
+        frequencies = np.fromiter(cfs.keys(), dtype=int, count=len(cfs))
+        coefficients = np.fromiter(cfs.values(), dtype=complex, count=len(cfs))
+        return cls(frequencies, coefficients)
+
+    @classmethod
+    def createFromCentered(cls, coefficients):
+        """Create a coefficient set from an array of coefficients of the
+        frequencies -h to h."""
+        h = len(coefficients) // 2
+        return cls(np.arange(-h, len(coefficients) - h), coefficients)
+
+    def __init__(self, frequencies=(), coefficients=()):
+        """Create a coefficient set using the frequencies and their coefficients."""
+        frequencies = np.asarray(frequencies, dtype=int).ravel()
+        coefficients = np.asarray(coefficients, dtype=complex).ravel()
+        if len(frequencies) != len(coefficients):
+            raise ValueError("There must be as many frequencies as coefficients.")
+        if np.any(np.diff(frequencies) <= 0):
+            indices = np.argsort(frequencies, kind="stable")
+            frequencies, coefficients = frequencies[indices], coefficients[indices]
+            if np.any(np.diff(frequencies) == 0):
+                raise ValueError("The frequencies must be unique.")
+        self.frequencies = frequencies
+        self.coefficients = coefficients
+        # When the frequencies are consecutive a coefficient is found by an offset
+        self.contiguous = len(frequencies) == 0 or (
+            frequencies[-1] - frequencies[0] == len(frequencies) - 1
+        )
+        self.index = None
+
+    def __getitem__(self, n):
+        """Return the coefficient of the frequency n, or the coefficient set
+        of the frequencies in a band if n is a slice."""
+        if isinstance(n, slice):
+            return self.band(n.start, n.stop)
+        i = self.find(n)
+        if i is None:
+            raise KeyError(n)
+        return complex(self.coefficients[i])
+
+    def find(self, n):
+        """Return the index of the frequency n or None. Like the keys of a
+        dictionary, an integral float matches its integer."""
+        try:
+            if isinstance(n, float) and n.is_integer():
+                n = int(n)
+            n = operator.index(n)
+        except TypeError:
+            return None
+        if self.contiguous:
+            i = n - int(self.frequencies[0]) if len(self) else -1
+            return i if 0 <= i < len(self) else None
+        if self.index is None:
+            self.index = {int(f): i for i, f in enumerate(self.frequencies)}
+        return self.index.get(n)
+
+    def __iter__(self):
+        """Iterate the frequencies in increasing order."""
+        return iter(self.frequencies.tolist())
+
+    def __len__(self):
+        """Return the number of coefficients."""
+        return len(self.frequencies)
+
+    def __contains__(self, n):
+        """Determine if the frequency n has a coefficient."""
+        return self.find(n) is not None
+
+    def __array__(self, dtype=None, copy=None):
+        """Return the array of the coefficients without copying it."""
+        if dtype is None or np.dtype(dtype) == self.coefficients.dtype:
+            return self.coefficients
+        return self.coefficients.astype(dtype)
+
+    def __repr__(self):
+        """Return the string representation of a coefficient set."""
+        return "CoefficientSet(" + str(dict(self.items())) + ")"
+
+    def items(self):
+        """Return the pairs (frequency, coefficient) in increasing frequency."""
+        return list(zip(self.frequencies.tolist(), self.coefficients.tolist()))
+
+    def values(self):
+        """Return the coefficients in increasing frequency."""
+        return self.coefficients.tolist()
+
+    def band(self, low=None, high=None):
+        """Return the coefficient set of the frequencies between low included
+        and high excluded."""
+        start = 0 if low is None else np.searchsorted(self.frequencies, low)
+        stop = len(self) if high is None else np.searchsorted(self.frequencies, high)
+        return CoefficientSet(self.frequencies[start:stop], self.coefficients[start:stop])
+
+    def select(self, mask):
+        """Return the coefficient set of the coefficients selected by the
+        boolean mask or the indices."""
+        return CoefficientSet(self.frequencies[mask], self.coefficients[mask])
+
+    def toDict(self):
+        """Return the dictionary {frequency: coefficient}."""
+        return dict(self.items())
+
+    def getNumpy(self):
+        """Return the frequencies and the coefficients arrays without copying them."""
+        return self.frequencies, self.coefficients
+
+    numpy = property(getNumpy)
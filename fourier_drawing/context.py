@@ -1,10 +1,13 @@
 from .draw import Draw
 from .rect import Rect
 from .window import Window
+from .recorder import VideoRecorder
+from .capture import CaptureSource
 
 from . import colors
 import time as tm
 import copy
+import sys
 
 # For the camera only
 from pygame.locals import *
@@ -19,6 +22,8 @@ import cv2
 class Camera:
     """The camera relies on opencv, pygame and numpy."""
 
+    fourccs = {"mp4": "MP4V", "avi": "DIVX"}  # Codecs of the video extensions
+
     def __init__(
         self,
         draw,
@@ -28,14 +33,17 @@ class Camera:
         build_capture_writer=False,
         filename="unnamed.mp4",
         framerate=15,
+        source=0,
     ):
         """Create an opencv camera. By default the capture is not active, it must
         be built using the build method, or by setting build to True in the
-        init method."""
+        init method. The source is the index of a camera or a video file."""
         self._draw = draw
         self.position = position
+        self.source = source
+        self.surface = None  # Surface of the latest frame shown
+        self.shown = 0  # Number of the latest frame shown
         self.filename = filename
-        self.fourccs = {"mp4": "MP4V", "avi": "DIVX"}
         self.framerate = framerate
         # Building videos components
         if build_capture:
@@ -45,11 +53,14 @@ class Camera:
         if build_capture_writer:
             self.buildCaptureWriter()
 
-    def buildCapture(self):
+    def buildCapture(self, source=None):
         """Build the capture with opencv. Having a separate function for the
         capture allows to have more efficiency for programs that do not need the
-        camera."""
-        self.capture = cv2.VideoCapture(0)
+        camera. The frames are read in the background by the capture source."""
+        if source is not None:
+            self.source = source
+        self.capture = CaptureSource(self.source)
+        self.shown = 0
 
     def buildCaptureWriter(self, filename=None, framerate=None):
         """Write the videos of the camera, this is just an odd concept, nothing
@@ -58,60 +69,108 @@ class Camera:
             filename = self.filename
         _, extension = filename.split(".")
         fourcc = self.fourccs[extension]
-        print(fourcc)
-        fourcc = cv2.VideoWriter_fourcc(*fourcc)
         if not framerate:
             framerate = self.framerate
-        self.capture_writer = cv2.VideoWriter(
-            filename, fourcc, framerate, frameSize=self._draw.window.size
+        self.capture_writer = VideoRecorder(
+            filename, fourcc, framerate, self._draw.window.size
         )
 
     def buildScreenWriter(self, filename=None, framerate=None):
-        """Write the videos of the screen."""
+        """Write the videos of the screen, the frames being encoded in the
+        background by the recorder."""
         if not filename:
             filename = self.filename
         _, extension = filename.split(".")
         fourcc = self.fourccs[extension]
-        fourcc = cv2.VideoWriter_fourcc(*fourcc)
         if not framerate:
             framerate = self.framerate
-        self.screen_writer = cv2.VideoWriter(
-            filename, fourcc, framerate, frameSize=self._draw.window.size
+        screen = self._draw.window.screen
+        w, h = screen.get_size()
+        if screen.get_bytesize() == 4:
+            # The pixels are copied as they are, the channels are picked later
+            order = [self.getByte(screen, shift) for shift in screen.get_shifts()[2::-1]]
+            shape, dtype = (h, w), np.uint32
+            conversion = lambda frame: frame.view(np.uint8).reshape(h, w, 4)[:, :, order]
+        else:
+            shape, dtype = (w, h, 3), np.uint8
+            conversion = lambda frame: cv2.cvtColor(
+                np.ascontiguousarray(frame.transpose(1, 0, 2)), cv2.COLOR_RGB2BGR
+            )
+        self.screen_writer = VideoRecorder(
+            filename,
+            fourcc,
+            framerate,
+            (w, h),
+            shape=shape,
+            dtype=dtype,
+            conversion=conversion,
         )
 
+    def getByte(self, surface, shift):
+        """Return the index of the byte of a channel in the pixels of the surface
+        given its shift."""
+        if sys.byteorder == "little":
+            return shift // 8
+        return surface.get_bytesize() - 1 - shift // 8
+
     def writeCapture(self):
         """Write the capture."""
         # Note this cannot work if the video capture is not built
         _, frame = self.capture.read()
-        self.capture_writer.write(frame)
+        if frame is not None:
+            self.capture_writer.write(frame)
 
     def writeScreen(self):
-        """Write the screen."""
-        output = pygame.surfarray.array3d(self._draw.window.screen)
-        output = cv2.transpose(output)
-        output = cv2.cvtColor(output, cv2.COLOR_RGB2BGR)
-        self.screen_writer.write(output)
+        """Copy the screen into a buffer of the recorder without blocking, the
+        frame is dropped if the recorder is late."""
+        if self.screen_writer.released:
+            return
+        acquired = self.screen_writer.acquire()
+        if acquired is None:
+            return
+        i, buffer = acquired
+        screen = self._draw.window.screen
+        if buffer.ndim == 2:
+            pixels = pygame.surfarray.pixels2d(screen).T
+        else:
+            pixels = pygame.surfarray.pixels3d(screen)
+        if pixels.shape != buffer.shape:  # The window was resized
+            del pixels
+            self.screen_writer.drop(i)
+            return
+        np.copyto(buffer, pixels)
+        del pixels  # Unlocks the screen
+        self.screen_writer.submit(i)
 
     def show(self):
-        """Show the video."""
-        ret, frame = self.capture.read()
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        frame = np.rot90(frame)
-        frame = pygame.surfarray.make_surface(frame)
-        self._draw.image(self._draw.window.screen, frame, self.position)
+        """Show the latest frame of the capture, without waiting for the device."""
+        count, frame = self.capture.read()
+        if frame is None:
+            return
+        if count != self.shown:
+            h, w = frame.shape[:2]
+            if self.surface is None or self.surface.get_size() != (w, h):
+                self.surface = pygame.Surface((w, h))
+            # Mirrored horizontally with its bgr channels reversed, by columns
+            pygame.surfarray.blit_array(self.surface, frame[:, ::-1, ::-1].swapaxes(0, 1))
+            self.shown = count
+        self._draw.image(self._draw.window.screen, self.surface, self.position)
 
     __call__ = show
 
     def endCaptureWriter(self):
         """End the video writer and save its content."""
+        self.capture_writer.release()
         del self.capture_writer
 
     def endScreenWriter(self):
         """End the screen writer and record its content."""
+        self.screen_writer.release()
         del self.screen_writer
 
     def endCapture(self):
         """End the camera by ending the video capture."""
+        self.capture.release()
         del self.capture
 
     def destroy(self):
@@ -184,11 +243,11 @@ class Camera:
     def __del__(self):
         """Delete the camera components if they exist."""
         if self.capturing:
-            del self.capture
+            self.endCapture()
         if self.screen_writing:
-            del self.screen_writer
+            self.endScreenWriter()
         if self.capture_writing:
-            del self.capture_writer
+            self.endCaptureWriter()
         self.destroy()
 
     def write(self):
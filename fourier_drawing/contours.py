@@ -0,0 +1,87 @@
+import numpy as np
+import cv2
+
+
+class ContourExtractor:
+    """Find the contours of an image using a blur, the canny algorithm and
+    opencv's contour finding, and convert them into the coordinates of the
+    plane in which the image is shown by the VisualFourier.
+    It does not rely on pygame so it can run without any window."""
+
+    def __init__(
+        self,
+        blur=5,
+        thresholds=(50, 150),
+        min_length=20,
+        min_area=0,
+        max_contours=None,
+        size=1,
+    ):
+        """Create a contour extractor using the size of the kernel of the
+        gaussian blur (0 for no blur), the thresholds of the canny algorithm,
+        the minimum length and area of the contours kept, the maximum number
+        of contours kept and the size of the image in the plane."""
+        self.blur = blur
+        self.thresholds = thresholds
+        self.min_length = min_length
+        self.min_area = min_area
+        self.max_contours = max_contours
+        self.size = size
+
+    def __call__(self, image):
+        """Return the list of the contours of the image, each contour being an
+        array of shape (n, 2) of positions in the plane, longest first."""
+        image = self.load(image)
+        contours = self.findContours(self.edges(image))
+        return [self.toPlane(contour, image.shape) for contour in contours]
+
+    def load(self, image):
+        """Return the image as an array, the image being an array or a path."""
+        if isinstance(image, np.ndarray):
+            return image
+        array = cv2.imread(str(image))
+        if array is None:
+            raise FileNotFoundError("The image " + str(image) + " cannot be read.")
+        return array
+
+    def gray(self, image):
+        """Return the image in shades of grey."""
+        if image.ndim == 3:
+            return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        return image
+
+    def edges(self, image):
+        """Return the map of the edges of the image."""
+        gray = self.gray(image)
+        if self.blur:
+            gray = cv2.GaussianBlur(gray, (self.blur, self.blur), 0)
+        return cv2.Canny(gray, *self.thresholds)
+
+    def findContours(self, edges):
+        """Return the contours of the edges in pixels, filtered by length and area."""
+        contours = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_NONE)[-2]
+        kept = []
+        for contour in contours:
+            length = cv2.arcLength(contour, False)
+            if length < self.min_length:
+                continue
+            if self.min_area and cv2.contourArea(contour) < self.min_area:
+                continue
+            kept.append((length, contour.reshape(-1, 2)))
+        kept.sort(key=lambda e: -e[0])
+        return [contour for length, contour in kept[: self.max_contours]]
+
+    def toPlane(self, pixels, shape):
+        """Convert positions in pixels of an image of the given shape into
+        positions in the plane, where the image is shown with its top left
+        corner at (-1/2, h/w/2) and its largest side of length 'size'."""
+        h, w = shape[:2]
+        if w > h:
+            sx, sy = self.size, h / w * self.size
+        else:
+            sx, sy = w / h * self.size, self.size
+        pixels = np.asarray(pixels, dtype=float).reshape(-1, 2)
+        positions = np.empty_like(pixels)
+        positions[:, 0] = -1 / 2 + pixels[:, 0] / w * sx
+        positions[:, 1] = h / w / 2 - pixels[:, 1] / h * sy
+        return positions
@@ -83,7 +83,7 @@ class Draw:
 
     def polygon(
         self, screen, color, positions, fill=False
-    ):  # No clue of what i'm doing to do here.
+    ):
         screen_positions = self.plane.getAllToScreen(positions, self.window)
         self.window.draw.polygon(screen, color, screen_positions, fill)
 
@@ -175,7 +175,7 @@ class Draw:
         return colors.nuance(c1, c2, a)
 
     def show(self):
-        self.plane.showGrid(self.window)
+        self.plane.showGrids(self.window)
         self.window.flip()
 
     def clear(self, **kwargs):
@@ -1,80 +1,25 @@
 from .interpolation import PolynomialInterpolation
-from .abstract import Point, Vector, Circle
+from .coefficients import CoefficientSet
+from .cache import CoefficientCache
+from .storage import saveComponents, loadComponents, writeCoefficients, readCoefficients
+from .transform import Fourier, EpicycleFrames, EpicycleIntegrator
+from .contours import ContourExtractor
+from .tour import TourBuilder
+from .renderer import EpicycleRenderer, TrailRenderer
+from .abstract import Point, Vector
 from .curves import Trajectory
 from pygame.locals import *
 from . import colors
 
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pygame
-import pickle
-import cmath
 import math
-import cv2
+import time
 import sys
 import os
 
 
-class Fourier:
-    def transform(pts, ncfs, wo=2 * math.pi):
-        """Apply the true fourier transform by
-        returning a dictionary of the coefficients."""
-        npts = len(pts)
-        h = ncfs // 2
-        cfs = {}
-        # Compute all coefficients
-        for n in range(-h, h + 1):
-            # Compute each coefficient
-            cn = 0
-            for iw in range(npts):
-                w = (
-                    iw / npts
-                )  # w is not a frequency but the variable of a parametric equation
-                fw = complex(*pts[iw])
-                cn += fw * cmath.exp(-1j * n * w * wo)
-            cn /= npts
-            cfs[n] = cn
-        return cfs
-
-    def inverseTransform(cfs, npts, wo=2 * math.pi):
-        """Apply the true fourier inverse transform
-        by returning the list of the points."""
-        ncfs = len(cfs)
-        h = npts // 2
-        pts = []
-        # Compute all the points
-        for it in range(npts):
-            t = (
-                it / npts
-            )  # t is not a time but the variable of a parametric equation of the final graph
-            # Compute each point
-            zpt = 0
-            for (
-                n,
-                cn,
-            ) in (
-                cfs.items()
-            ):  # Addition is commutative, even though the dictionary is unordered, the sum of the terms will be the same
-                zpt += cn * cmath.exp(1j * wo * n * t)
-            pts.append((zpt.real, zpt.imag))
-        return pts
-
-    def build(cfs, t, wo=2 * math.pi):
-        """Return the 'construction graph' with a given time 't'."""
-        ncfs = len(cfs)
-        h = ncfs // 2
-        cst = [(0, 0)]
-        zpt = cfs[0]
-        cst.append((zpt.real, zpt.imag))
-        for n in range(1, h + 1):
-            pcf = cfs[n] * cmath.exp(1j * wo * n * t)
-            ncf = cfs[-n] * cmath.exp(1j * wo * (-n) * t)
-            zpt += pcf
-            cst.append((zpt.real, zpt.imag))
-            zpt += ncf
-            cst.append((zpt.real, zpt.imag))
-        return cst
-
-
 class VisualFourier:
     """Show an application of the fourier transform."""
 
@@ -83,19 +28,20 @@ class VisualFourier:
         self,
         context,
         image=None,
-        coefficients=[],
+        coefficients={},
         directory="../FourierObjects",
         filename="Fourier",
         coefficients_filename="fourier_coefficients.txt",
     ):
         """Initialization."""
         self.context = context
-        self.coefficients = coefficients
+        self.coefficients = CoefficientSet.create(coefficients)
         self.coefficients_filename = coefficients_filename
 
         # Directory
         self.directory = directory
         self.filename = filename
+        self.cache = CoefficientCache(os.path.join(directory, "cache"))
 
         # Graphs
         self.graphs = [[], [], []]
@@ -112,12 +58,23 @@ class VisualFourier:
         self.pause = False
         self.include = True  # Include the last point of the interpolation
 
+        # Transform computed in a background thread
+        self.executor = None
+        self.job = None  # Future of the coefficients
+        self.job_id = 0  # Identifier of the latest job, the results of the others are stale
+        self.job_start = 0
+
         # Precision settings
         # self.coefficients_number=100
         self.sample_number = 5
         self.display_number = 100  # Number of points of the display graph
         self.integral_precision = 100
+        self.transform_mode = "sample"  # Either sample or polygon
+        self.polygon_coefficients_number = 201  # Number of coefficients of the polygon transform
+        self.truncation = {}  # Targets of the truncation of the coefficients: energy, error or count
         self.points_radius = 5
+        self.frames_memory = 2 ** 28  # Memory allowed for the epicycle frames
+        self.integrate = None  # Use the epicycle integrator, if None it is chosen when the frames do not fit in memory
 
         # Optional settings
         # Graph shown
@@ -129,6 +86,7 @@ class VisualFourier:
         self.show_circles = True
         self.show_sample = True
         self.show_camera = False
+        self.show_arrows = True
         # Graph color
         self.color_polynomial = colors.BLUE
         self.color_drawing = colors.GREEN
@@ -136,18 +94,16 @@ class VisualFourier:
         self.color_vectors = colors.WHITE
         self.color_circles = colors.GREY
         self.color_sample = colors.YELLOW
+        self.renderer = EpicycleRenderer()
+        self.trail = TrailRenderer()
 
         # Set the image for sampling
+        self.image_path = image
         if image is None:
             self.image = None
             self.show_image = False
         else:
             self.image = self.context.loadImage(image)
-            # Trying to convert a pygame image into a pil image that can be used for the canny algorithm.
-            # s=self.image.get_size()
-            # self.image=pygame.image.tostring(self.image,"RGBA",False)
-            # self.image=Image.frombytes("RGBA",s,self.image)
-            # self.image=cv2.Canny(self.image,50,150)
 
     def __call__(self):
         """Main loop."""
@@ -156,6 +112,30 @@ class VisualFourier:
             self.events()
             self.main()
             self.show()
+        self.shutdown()
+
+    def animate(self, callback=None):
+        """Run the construction as fast as possible, without any event nor
+        clock, so that it can be driven by a script with a headless context.
+        The callback is called with the VisualFourier after each frame shown.
+        The construction starts from the coefficients already loaded, if
+        there are some, instead of transforming the drawing again.
+        Return the number of frames shown."""
+        if len(self.coefficients):
+            self.mode = 1
+            self.buildFrames()
+            self.seek(0)
+        else:
+            self.setMode(1)
+            self.waitTransform()
+        frames = 0
+        while self.mode == 1 and self.context.open:
+            self.main()
+            self.show()
+            if callback:
+                callback(self)
+            frames += 1
+        return frames
 
     def events(self):
         """Deal with all the events."""
@@ -167,7 +147,7 @@ class VisualFourier:
                 if event.key == K_ESCAPE:
                     self.context.open = False
                 if event.key == K_SPACE or event.key == K_MENU or event.key == K_q:
-                    self.setMode((self.mode + 1) % 3)
+                    self.nextMode()
                 if event.key == K_0:
                     self.show_polynomial = not (self.show_polynomial)
                 if event.key == K_1:
@@ -182,6 +162,8 @@ class VisualFourier:
                     self.show_circles = not (self.show_circles)
                 if event.key == K_6:
                     self.show_sample = not (self.show_sample)
+                if event.key == K_7:
+                    self.show_arrows = not (self.show_arrows)
                 if event.key == K_r:
                     self.reset()
                 if event.key == K_z:
@@ -196,16 +178,22 @@ class VisualFourier:
                     self.screenshot(self.directory)
                 if event.key == K_p:
                     self.pause = not (self.pause)
+                if event.key == K_t:
+                    self.switchTransformMode()
+                if event.key == K_x and self.transforming:
+                    self.cancelTransform()
+                if event.key == K_e and self.mode == 0 and self.image_path:
+                    self.extract()
                 if event.key == K_f:
                     self.context.switch()
                 if event.key == K_c:
                     self.show_camera = not (self.show_camera)
                     if self.show_camera:
                         self.context.camera.buildCapture()
-                    else:
-                        self.context.camera.destroy()
+                    elif self.context.camera.capturing:
+                        self.context.camera.endCapture()
             if event.type == pygame.MOUSEBUTTONDOWN:
-                if (event.button == 1) and (self.mode == 0):
+                if (event.button == 1) and (self.mode == 0 or self.transforming):
                     self.place()
                     self.updateSample()
                 if event.button == 4:
@@ -223,11 +211,13 @@ class VisualFourier:
         if self.mode == 0:  # drawing
             pass
         elif self.mode == 1:  # construction
-            if self.step > self.max_step:
+            if self.transforming:
+                self.receiveTransform()
+            elif self.step > self.max_step:
                 self.mode = 2
             else:
-                self.construction = Fourier.build(self.coefficients, self.time)
-                self.display.append(self.construction[-1])
+                self.construction = self.frames[self.step]
+                self.display.append(tuple(self.construction[-1]))
                 if not self.pause:
                     self.step += 1
         elif self.mode == 2:  # display
@@ -251,7 +241,7 @@ class VisualFourier:
         if self.show_camera:
             self.context.camera.show()
 
-        if self.mode == 0:
+        if self.mode == 0 or self.transforming:
             if self.show_polynomial:
                 self.drawPolynomial(drawing, self.color_polynomial)
             if self.show_drawing:
@@ -268,7 +258,7 @@ class VisualFourier:
             if self.show_circles:
                 self.drawCircles(construction, self.color_circles)
             if self.show_display:
-                self.drawGraph(display, self.color_display)
+                self.drawTrail(display, self.color_display)
             if self.show_sample:
                 self.drawPoints(self.sample, self.color_sample)
         elif self.mode == 2:
@@ -277,7 +267,7 @@ class VisualFourier:
             if self.show_drawing:
                 self.drawGraph(drawing, self.color_drawing)
             if self.show_display:
-                self.drawGraph(display, self.color_display)
+                self.drawTrail(display, self.color_display)
             if self.show_sample:
                 self.drawPoints(self.sample, self.color_sample)
 
@@ -288,14 +278,17 @@ class VisualFourier:
             self.context.print(
                 "Pause", position=(sx - 100, 10), size=35, conversion=False
             )
+        if self.transforming:
+            self.showProgress()
         self.context.showConsole()
         self.context.flip()
 
     def reset(self):
         """Reset the graphs, the sample and the mode."""
+        self.cancelTransform(False)
         self.mode = 0
         self.graphs = [[], [], []]
-        self.coefficients = []
+        self.coefficients = CoefficientSet()
         self.sample = []
 
     def getVectors(self, graph):
@@ -312,6 +305,7 @@ class VisualFourier:
 
     def setMode(self, mode):
         """Change the mode into another."""
+        self.cancelTransform(False)
         self.mode = mode
         if self.mode == 0:
             self.setDrawingMode()
@@ -321,6 +315,12 @@ class VisualFourier:
             self.setDisplayMode()
         self.context.text.append("mode: " + self.messages[self.mode])
 
+    def nextMode(self):
+        """Switch to the next mode, unless the coefficients are being computed,
+        as the display mode would show the previous ones."""
+        if not self.transforming:
+            self.setMode((self.mode + 1) % 3)
+
     def setDrawingMode(self):
         """Set the attributes before starting the drawing mode."""
         pass
@@ -331,22 +331,192 @@ class VisualFourier:
         self.display = []
         # t=Trajectory.createFromTuples(self.drawing)
         # l=t.sampleSegments(self.sample_number)
-        self.coefficients = Fourier.transform(self.sample, self.coefficients_number)
+        coefficients = self.cache.get(self.cache_key)
+        if coefficients is None:
+            self.submitTransform()
+        else:
+            self.coefficients = coefficients
+            self.buildFrames()
+
+    def transform(self, drawing=None, sample=None, parameters=None):
+        """Return the coefficients of the drawing according to the transform
+        mode, the drawing, the sample and the parameters of the transform
+        being those of the VisualFourier by default."""
+        if drawing is None:
+            drawing = self.drawing
+        if sample is None:
+            sample = self.sample
+        if parameters is None:
+            parameters = self.parameters
+        if parameters["transform_mode"] == "polygon":
+            # The closing segment lasts as long as a single sample does
+            durations = [1] * (len(drawing) - 1) + [1 / parameters["sample_number"]]
+            return Fourier.polygonTransform(
+                drawing, parameters["polygon_coefficients_number"], durations=durations
+            )
+        return Fourier.transform(sample, len(sample))
+
+    def computeCoefficients(self, job_id, key, drawing, sample, parameters):
+        """Return the job id, the cache key, the coefficients of the drawing
+        truncated if needed and the report of the truncation.
+        It runs in the background thread so it only uses its arguments."""
+        coefficients = self.transform(drawing, sample, parameters)
+        report = None
+        if parameters["truncation"]:
+            coefficients, report = Fourier.truncate(
+                coefficients, **parameters["truncation"]
+            )
+        return job_id, key, coefficients, report
+
+    def submitTransform(self):
+        """Compute the coefficients of the drawing in a background thread so
+        that the window keeps responding, any previous job being stale.
+        The duration shown is the one since the first job which was neither
+        received nor cancelled."""
+        if not self.transforming:
+            self.job_start = time.perf_counter()
+        self.cancelTransform(False)
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(1)
+        self.job_id += 1
+        # The settings are copied so that changing them does not affect the job
+        parameters = dict(self.parameters, truncation=dict(self.truncation))
+        self.job = self.executor.submit(
+            self.computeCoefficients,
+            self.job_id,
+            self.cache_key,
+            list(self.drawing),
+            list(self.sample),
+            parameters,
+        )
+
+    def receiveTransform(self):
+        """Start the construction with the coefficients of the job when they
+        are computed. Return True if they are received."""
+        if not self.job.done():
+            return False
+        job_id, key, coefficients, report = self.job.result()
+        self.job = None
+        if job_id != self.job_id:
+            return False
+        if report:
+            self.context.console.append(
+                f"{report['count']} coefficients, max error: {report['max']:.3g}"
+            )
+        self.cache.put(key, coefficients)
+        self.coefficients = coefficients
+        self.step = 0
+        self.display = []
+        self.buildFrames()
+        return True
+
+    def waitTransform(self):
+        """Wait for the coefficients of the job and start the construction."""
+        if self.transforming:
+            self.job.result()
+            self.receiveTransform()
+
+    def cancelTransform(self, drawing=True):
+        """Forget the job computing the coefficients, whose result will be
+        ignored, and go back to the drawing mode if drawing is True."""
+        if self.job is None:
+            return
+        self.job.cancel()
+        self.job = None
+        self.job_id += 1
+        if drawing:
+            self.mode = 0
+            self.context.console.append("The transform is cancelled.")
+
+    def shutdown(self):
+        """Cancel the job and stop the background thread, so that quitting
+        does not wait for the jobs submitted."""
+        self.cancelTransform(False)
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def isTransforming(self):
+        """Determine if the coefficients are being computed."""
+        return self.job is not None
+
+    def showProgress(self):
+        """Show that the coefficients are being computed and how to cancel."""
+        sx, sy = self.context.size
+        elapsed = time.perf_counter() - self.job_start
+        dots = "." * (int(2 * elapsed) % 4)
+        self.context.print(
+            f"Transform {elapsed:.1f}s{dots} (x to cancel)",
+            position=(10, sy - 40),
+            size=25,
+            conversion=False,
+        )
+
+    def switchTransformMode(self):
+        """Switch the transform mode between sample and polygon."""
+        if self.transform_mode == "polygon":
+            self.transform_mode = "sample"
+        else:
+            self.transform_mode = "polygon"
+        self.updateSample()
+        self.context.console.append("transform: " + self.transform_mode)
+
+    def buildFrames(self):
+        """Build the frames of the construction, either by precomputing them
+        all or by integrating them step by step."""
+        nframes = self.max_step + 1
+        period = self.max_step + int(self.include)
+        integrate = self.integrate
+        if integrate is None:
+            integrate = 16 * (len(self.coefficients) + 1) * nframes > self.frames_memory
+        if integrate:
+            self.frames = EpicycleIntegrator(self.coefficients, nframes, period)
+        else:
+            self.frames = EpicycleFrames(self.coefficients, nframes, period)
+
+    def seek(self, step):
+        """Go to the step of the construction, the display graph being computed
+        directly from the coefficients instead of replaying the previous steps."""
+        period = self.max_step + int(self.include)
+        display = Fourier.evaluate(self.coefficients, np.arange(step) / period)
+        self.display = [tuple(p) for p in display.tolist()]
+        self.step = step
 
     def setDisplayMode(self):
         """Set the attributes before starting the display mode."""
         self.step = self.max_step + int(self.include)
         self.display = Fourier.inverseTransform(self.coefficients, self.display_number)
 
+    def extract(self, extractor=None, builder=None):
+        """Replace the drawing by a single tour through the contours of the
+        image, which is transformed as a polygon as it has many points."""
+        if extractor is None:
+            extractor = ContourExtractor()
+        if builder is None:
+            builder = TourBuilder(improvement_time=1)
+        contours = extractor(self.image_path)
+        if contours:
+            self.drawing = [tuple(p) for p in builder(contours).tolist()]
+            self.transform_mode = "polygon"
+            self.updateSample()
+        self.context.console.append(f"{len(contours)} contours were extracted.")
+
     def place(self):
         """Place a point."""
         p = self.context.point()
         self.drawing.append(p)
 
     def updateSample(self):
-        """Update the sample."""
-        t = Trajectory.createFromTuples(self.drawing)
-        self.sample = t.sampleSegments(self.sample_number, include=self.include)
+        """Update the sample, the polygon transform does not need to sample
+        the segments of the drawing. The coefficients being computed are
+        computed again for the new drawing."""
+        if self.transform_mode == "polygon":
+            self.sample = [Point(*p) for p in self.drawing]
+        else:
+            t = Trajectory.createFromTuples(self.drawing)
+            self.sample = t.sampleSegments(self.sample_number, include=self.include)
+        if self.transforming:
+            self.submitTransform()
 
     def screenshot(self):
         """Make a screenshot of the window."""
@@ -366,20 +536,22 @@ class VisualFourier:
     def save(self):
         """Save the sampled graph and fourier's coefficients."""
         path = self.directory + "/" + self.filename
-        with open(path, "wb") as f:
-            pickle.dump(self.dictionary, f)
+        saveComponents(path, self.dictionary)
+        if self.image_path:
+            self.cache.put(self.image_cache_key, self.dictionary)
         self.context.console.append("The Fourier components are saved.")
 
     def saveCoefficients(self):
         """Save the coefficients in a txt file."""
         path = self.directory + "/" + self.coefficients_filename
-        with open(path, mode="w", encoding="utf-8") as file:
-            file.write(
-                "\n".join(
-                    [f"{k}:{v}" for k, v in self.dictionary["coefficients"].items()]
-                )
-            )
-            self.context.console.append("The Fourier coefficients are written.")
+        writeCoefficients(path, self.dictionary["coefficients"])
+        self.context.console.append("The Fourier coefficients are written.")
+
+    def loadCoefficients(self):
+        """Load the coefficients of the txt file."""
+        path = self.directory + "/" + self.coefficients_filename
+        self.coefficients = readCoefficients(path)
+        self.context.console.append("The Fourier coefficients are read.")
 
     def load(self):
         """Load the fourier's coefficients."""
@@ -387,20 +559,61 @@ class VisualFourier:
         print(self.directory, self.filename)
         path = os.path.abspath(path)
         print('coefficients:', path)
-        with open(path, "rb") as f:
-            dictionary = pickle.load(f)
-        self.coefficients = dictionary["coefficients"]
+        self.setDictionary(loadComponents(path))
+        self.context.console.append("The Fourier components are loaded.")
+
+    def loadCache(self):
+        """Load the fourier's coefficients saved for the image with the same
+        parameters if there are some, and return whether they are loaded."""
+        if not self.image_path:
+            return False
+        dictionary = self.cache.get(self.image_cache_key)
+        if dictionary is None:
+            return False
+        self.setDictionary(dictionary)
+        self.context.console.append("The Fourier components are loaded from the cache.")
+        return True
+
+    def setDictionary(self, dictionary):
+        """Set the coefficients and the graphs using the dictionary."""
+        self.coefficients = CoefficientSet.create(dictionary["coefficients"])
         self.display = dictionary["display"]
         self.construction = dictionary["construction"]
         self.drawing = dictionary["drawing"]
         self.updateSample()
-        self.context.console.append("The Fourier components are loaded.")
+
+    def getParameters(self):
+        """Return the parameters of the transform."""
+        return {
+            "sample_number": self.sample_number,
+            "include": self.include,
+            "transform_mode": self.transform_mode,
+            "polygon_coefficients_number": self.polygon_coefficients_number,
+            "truncation": self.truncation,
+        }
+
+    def getCacheKey(self):
+        """Return the key of the coefficients of the drawing in the cache."""
+        return CoefficientCache.key(
+            self.drawing,
+            coefficients_number=self.coefficients_number,
+            **self.parameters,
+        )
+
+    def getImageCacheKey(self):
+        """Return the key of the components saved for the image in the cache."""
+        return CoefficientCache.key(self.image_path, **self.parameters)
+
+    parameters = property(getParameters)
+    cache_key = property(getCacheKey)
+    image_cache_key = property(getImageCacheKey)
 
     def getTime(self):
         """Return the time of the construction."""
         return self.step / (self.max_step + int(self.include))
 
     time = property(getTime)
+    transforming = property(isTransforming)
 
     # Graphical functions
     def distance(self, p1, p2):
@@ -409,18 +622,12 @@ class VisualFourier:
 
     def drawVectors(self, index, color):
         """Draw the vectors from the points."""
-        graph = self.graphs[index]
-        for i in range(len(graph) - 1):
-            v = Vector.createFromTwoTuples(graph[i], graph[i + 1], color=color)
-            v.showFromTuple(self.context, graph[i])
+        self.renderer.arrows = self.show_arrows
+        self.renderer.drawVectors(self.context, self.graphs[index], color)
 
     def drawCircles(self, index, color):
         """Draw the circles from the points."""
-        graph = self.graphs[index]
-        for i in range(len(graph) - 1):
-            radius = self.distance(graph[i], graph[i + 1])
-            c = Circle.createFromPointAndRadius(graph[i], radius, color=color)
-            c.show(self.context)
+        self.renderer.drawCircles(self.context, self.graphs[index], color)
 
     def drawGraph(self, index, color, connected=False, width=1, conversion=True):
         """Draw the graph."""
@@ -430,6 +637,10 @@ class VisualFourier:
                 self.context.screen, color, graph, connected, width, conversion
             )
 
+    def drawTrail(self, index, color):
+        """Draw the graph which grows at each step incrementally."""
+        self.trail.draw(self.context, self.graphs[index], color)
+
     def drawPolynomial(self, index, color, precision=200):
         """Draw the polynomial interpolation of the points."""
         graph = self.graphs[index]
@@ -475,6 +686,8 @@ class VisualFourier:
         self.graphs[2] = graph
 
     def getCoefficientsNumber(self):
+        if self.transform_mode == "polygon":
+            return self.polygon_coefficients_number
         return len(self.sample)
 
     drawing = property(getDrawing, setDrawing)
@@ -506,7 +719,6 @@ if __name__ == "__main__":
 
     context = Context(name="Application of the Fourier Transform.", fullscreen=False)
     fourier = VisualFourier(context, image=image, directory="../FourierObjects")
-    if fourier.filename in os.listdir(fourier.directory):
-        fourier.load()
+    fourier.loadCache()
     fourier()
     fourier.save()
@@ -351,14 +351,17 @@ class Manager:
 
     def switchScreenWriting(self):
         """Switch the screen writing mode."""
+        writer = None
         if self.context.camera.screen_writing:
-            self.context.camera.screen_writer.release()
+            writer = self.context.camera.screen_writer
+            writer.release()
         self.context.camera.switchScreenWriting()
         if self.context.camera.screen_writing:
             self.context.console("The screen is being written.")
         else:
             self.context.console("The screen video has been released")
             self.context.console("and is not being written anymore.")
+            self.context.console(writer.report())
 
     def switchCaptureWriting(self):
         """Switch the capture writing mode."""
@@ -415,7 +418,7 @@ class Manager:
         if not self.pause:
             self.update()
             self.count()
-        self.context.camera.write()  # Write on the camera writers if they are on
+        self.context.camera.write()  # Hand the frames to the camera writers if they are on
 
     def update(self):
         """Update the components of the manager of the loop. This method is to be
@@ -1,6 +1,7 @@
 from .window import Window
 from pygame.locals import *
 
+import pygame
 import math
 import numpy as np
 from . import colors
@@ -11,6 +12,7 @@ class Plane:
         """Create a plane using optionals theme and view."""
         self.createTheme(theme)
         self.createView(view)
+        self.grid_layer = GridLayer()
 
     def createTheme(self, theme={}):
         """Initializes the position and the colors for the view of the plane using optional theme."""
@@ -153,10 +155,9 @@ class Plane:
                 window.print(str([x, y]), [X, Y], size=20)
 
     def showGrids(self, window, nscale=None):
-        """Show the grid using the window and optional scales."""
-        ascale = self.getScale(window)  # ascale like actual_scale
-        for scale in self.getScales(window, nscale, ascale):
-            self.showGrid(window, scale)
+        """Show the grid using the window and optional scales.
+        The grids are drawn once per view on a layer which is reused."""
+        self.grid_layer.show(self, window, nscale)
 
     def getScales(self, window, nscale=None, scale=None):
         """Return the scales ."""
@@ -223,12 +224,20 @@ class Plane:
         y = int(wsy / 2 - (y - py) * uy)
         return [x, y]
 
-    def getAllToScreen(self, positions, window):
-        """Return the list of screen positions using the list of plane positions."""
-        screen_positions = []
-        for position in positions:
-            screen_positions.append(self.getToScreen(position, window))
-        return screen_positions
+    def getAllToScreen(self, positions, window, out=None):
+        """Return the array of screen positions using an array of plane positions
+        of shape (n, 2), without converting the positions one by one.
+        The screen positions are written in the optional integer array out."""
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        if out is None:
+            out = np.empty(positions.shape, dtype=int)
+        px, py = self.position
+        ux, uy = self.units
+        wsx, wsy = window.size
+        # The float to integer casting truncates like int in getToScreen
+        np.copyto(out[:, 0], (positions[:, 0] - px) * ux + wsx / 2, casting="unsafe")
+        np.copyto(out[:, 1], wsy / 2 - (positions[:, 1] - py) * uy, casting="unsafe")
+        return out
 
     def getFromScreen(self, position, window):
         """Return a plane position using a position in the screen."""
@@ -240,13 +249,23 @@ class Plane:
         y = (wsy / 2 - y) / uy + py
         return [x, y]
 
-    def getAllFromScreen(self, position, window):
-        """Return the list of plane positions using the list of screen positions."""
-        plane_positions = []
-        for position in positions:
-            planes_positions.append(self.getFromScreen(position, window))
+    def getAllFromScreen(self, positions, window):
+        """Return the array of plane positions using an array of screen positions
+        of shape (n, 2)."""
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        px, py = self.position
+        ux, uy = self.units
+        wsx, wsy = window.size
+        plane_positions = np.empty_like(positions)
+        plane_positions[:, 0] = (positions[:, 0] - wsx / 2) / ux + px
+        plane_positions[:, 1] = (wsy / 2 - positions[:, 1]) / uy + py
         return plane_positions
 
+    def getView(self, window):
+        """Return the position, the units and the size of the window as a tuple
+        which changes whenever the view of the plane changes."""
+        return (*self.position, *self.units, *window.size)
+
     def getCorners(self, window):
         """Return the corners of the present view."""
         wsx, wsy = window.size
@@ -319,6 +338,102 @@ class Plane:
         return corners
 
 
+class GridLayer:
+    """Surface on which the grids of a plane are drawn once per view and which
+    is blitted at each frame. When the plane is only moved, the surface is
+    scrolled and only the uncovered strips are drawn again."""
+
+    def __init__(self):
+        """Create an empty grid layer."""
+        self.surface = None
+        self.key = None
+        self.origin = None
+        self.builds = 0
+        self.scrolls = 0
+
+    def getKey(self, plane, window, nscale):
+        """Return what the grids depend on, apart from the position."""
+        theme = plane.theme
+        return (
+            *plane.units,
+            *window.size,
+            nscale,
+            tuple(theme["grid color"]),
+            tuple(theme["background"]),
+        )
+
+    def getOrigin(self, plane, window):
+        """Return the position on the screen of the origin of the plane, in
+        whole pixels so that the surface can be scrolled exactly."""
+        px, py = plane.position
+        ux, uy = plane.units
+        wsx, wsy = window.size
+        return (math.floor(wsx / 2 - px * ux), math.floor(wsy / 2 + py * uy))
+
+    def show(self, plane, window, nscale=None):
+        """Update the surface if the view changed and blit it on the window."""
+        if not nscale:
+            nscale = plane.theme["grid nscale"]
+        key = self.getKey(plane, window, nscale)
+        origin = self.getOrigin(plane, window)
+        if key != self.key or self.surface is None:
+            self.key = key
+            self.origin = origin
+            self.surface = pygame.Surface(window.size)
+            self.surface.set_colorkey(plane.theme["background"])
+            self.draw(plane, window, nscale, self.surface.get_rect())
+            self.builds += 1
+        elif origin != self.origin:
+            self.scroll(plane, window, nscale, origin)
+        window.screen.blit(self.surface, (0, 0))
+
+    def scroll(self, plane, window, nscale, origin):
+        """Scroll the surface to the new origin and draw the uncovered strips."""
+        dx, dy = origin[0] - self.origin[0], origin[1] - self.origin[1]
+        self.origin = origin
+        w, h = self.surface.get_size()
+        if abs(dx) >= w or abs(dy) >= h:
+            self.draw(plane, window, nscale, self.surface.get_rect())
+            self.builds += 1
+            return
+        self.surface.scroll(dx, dy)
+        strips = []
+        if dx > 0:
+            strips.append(pygame.Rect(0, 0, dx, h))
+        elif dx < 0:
+            strips.append(pygame.Rect(w + dx, 0, -dx, h))
+        if dy > 0:
+            strips.append(pygame.Rect(0, 0, w, dy))
+        elif dy < 0:
+            strips.append(pygame.Rect(0, h + dy, w, -dy))
+        for rect in strips:
+            self.draw(plane, window, nscale, rect)
+        self.scrolls += 1
+
+    def draw(self, plane, window, nscale, rect):
+        """Draw the grids of the plane in the rect of the surface."""
+        surface = self.surface
+        surface.set_clip(rect)
+        surface.fill(plane.theme["background"], rect)
+        ox, oy = self.origin
+        ux, uy = plane.units
+        # Positions in the plane of the rect, with a margin of a pixel
+        xmin, xmax = (rect.left - ox - 1) / ux, (rect.right - ox + 1) / ux
+        ymin, ymax = (oy - rect.bottom - 1) / uy, (oy - rect.top + 1) / uy
+        ascale = plane.getScale(window)
+        for scale in plane.getScales(window, nscale, ascale):
+            color = plane.getUnitsColor(scale, ascale)
+            unit = 10 ** scale
+            # The lines only depend on their index so they match after scrolling
+            for i in range(math.ceil(xmin / unit), math.floor(xmax / unit) + 1):
+                x = ox + math.floor(i * unit * ux)
+                pygame.draw.line(surface, color, (x, rect.top), (x, rect.bottom - 1))
+            for i in range(math.ceil(ymin / unit), math.floor(ymax / unit) + 1):
+                y = oy + math.floor(-i * unit * uy)
+                pygame.draw.line(surface, color, (rect.left, y), (rect.right - 1, y))
+        surface.set_clip(None)
+
+
 if __name__ == "__main__":
     window = Window(fullscreen=False)
     theme = {
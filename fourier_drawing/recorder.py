@@ -0,0 +1,116 @@
+import numpy as np
+import threading
+import queue
+import cv2
+
+
+class VideoRecorder:
+    """Video writer which encodes the frames in a background thread, so that
+    recording does not slow down the main loop. The frames are copied into a
+    ring of preallocated buffers which are handed to the thread through a
+    bounded queue, and a frame is dropped when no buffer is free."""
+
+    def __init__(
+        self,
+        filename,
+        fourcc,
+        framerate,
+        size,
+        buffers=8,
+        shape=None,
+        dtype=np.uint8,
+        conversion=None,
+    ):
+        """Create a recorder using the filename, the name of the codec, the
+        number of frames per second, the size of the video, the number of
+        buffers, their shape and type, which are those of the bgr frames by
+        default, and the optional function converting a buffer into a bgr
+        frame, which is called by the writing thread."""
+        self.size = tuple(size)
+        self.conversion = conversion
+        w, h = self.size
+        if shape is None:
+            shape = (h, w, 3)
+        self.buffers = [np.empty(shape, dtype=dtype) for i in range(buffers)]
+        self.free = queue.Queue()
+        for i in range(buffers):
+            self.free.put(i)
+        self.queue = queue.Queue(maxsize=buffers)
+        self.writer = cv2.VideoWriter(
+            filename, cv2.VideoWriter_fourcc(*fourcc), framerate, frameSize=self.size
+        )
+        self.written = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.released = False
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def acquire(self):
+        """Return the index of a free buffer and the buffer, or None if they
+        are all waiting to be written, in which case the frame is dropped."""
+        try:
+            i = self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return None
+        return i, self.buffers[i]
+
+    def submit(self, i):
+        """Hand the buffer i, filled with a frame, to the writing thread."""
+        self.queue.put_nowait(i)
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def drop(self, i):
+        """Give back the buffer i without writing it."""
+        self.dropped += 1
+        self.free.put(i)
+
+    def write(self, frame):
+        """Copy the frame into a free buffer to be written without blocking."""
+        if self.released:
+            return
+        acquired = self.acquire()
+        if acquired is None:
+            return
+        i, buffer = acquired
+        if frame.shape != buffer.shape:
+            self.drop(i)
+            return
+        np.copyto(buffer, frame)
+        self.submit(i)
+
+    def run(self):
+        """Encode the frames of the queue until None is received."""
+        while True:
+            i = self.queue.get()
+            if i is None:
+                break
+            frame = self.buffers[i]
+            if self.conversion is not None:
+                frame = self.conversion(frame)
+            self.writer.write(frame)
+            self.written += 1
+            self.free.put(i)
+
+    def getDepth(self):
+        """Return the number of frames waiting to be written."""
+        return self.queue.qsize()
+
+    def release(self):
+        """Write the frames left and release the video."""
+        if self.released:
+            return
+        self.released = True
+        self.queue.put(None)
+        self.thread.join()
+        self.writer.release()
+
+    def report(self):
+        """Return the counters of the recorder as a text."""
+        return (
+            f"{self.written} frames written, {self.dropped} dropped, "
+            f"max queue depth {self.max_depth}"
+        )
+
+    depth = property(getDepth)
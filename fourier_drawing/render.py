@@ -0,0 +1,155 @@
+from .context import Context, Camera
+from .fourier import VisualFourier
+from .storage import loadComponents
+
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import argparse
+import time
+import cv2
+import os
+
+
+class VideoRenderer:
+    """Render the construction of a coefficients file of the VisualFourier into
+    a video without any window. The steps are split into ranges rendered by a
+    pool of processes, each range into a chunk, and the chunks are then
+    concatenated in order into the video."""
+
+    # The chunks are lossless so that the frames are only compressed once
+    chunk_fourcc = "FFV1"
+    chunk_extension = ".mkv"
+
+    def __init__(
+        self,
+        directory="FourierObjects",
+        size=(1280, 720),
+        max_step=1000,
+        framerate=30,
+        workers=None,
+        chunks=None,
+        attributes={},
+    ):
+        """Create a renderer using the directory of the coefficients files, the
+        size of the video, the number of steps of the construction, the number
+        of frames per second, the number of processes and of chunks, and the
+        attributes set on the VisualFourier, such as the graphs shown."""
+        self.directory = directory
+        self.size = tuple(size)
+        self.max_step = max_step
+        self.framerate = framerate
+        self.workers = workers or os.cpu_count() or 1
+        self.chunks = chunks or self.workers
+        self.attributes = attributes
+
+    def __call__(self, filename, output):
+        """Render the coefficients file into the output video and print the
+        timings. Return the path of the video."""
+        # A legacy file is converted once before the workers read it
+        loadComponents(os.path.join(self.directory, filename))
+        t = time.perf_counter()
+        ranges = self.split(self.max_step + 1, self.chunks)
+        paths = [f"{output}.{i}{self.chunk_extension}" for i in range(len(ranges))]
+        with ProcessPoolExecutor(self.workers) as executor:
+            jobs = [
+                executor.submit(self.renderRange, filename, start, stop, path)
+                for (start, stop), path in zip(ranges, paths)
+            ]
+            for job in jobs:
+                job.result()
+        print(f"rendering {time.perf_counter() - t:.3f}s")
+        t = time.perf_counter()
+        self.concatenate(paths, output)
+        print(f"concatenation {time.perf_counter() - t:.3f}s")
+        return output
+
+    def split(self, nframes, n):
+        """Split the frames into at most n ranges (start, stop) of similar sizes."""
+        bounds = np.linspace(0, nframes, min(n, nframes) + 1).astype(int)
+        return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+    def createFourier(self, filename):
+        """Return a VisualFourier of the coefficients file drawing on a headless
+        context, ready to show the construction."""
+        context = Context(name=filename, size=self.size, headless=True)
+        fourier = VisualFourier(context, directory=self.directory, filename=filename)
+        for name, value in self.attributes.items():
+            setattr(fourier, name, value)
+        fourier.max_step = self.max_step
+        fourier.load()
+        fourier.mode = 1
+        fourier.buildFrames()
+        fourier.seek(0)
+        return fourier
+
+    def createWriter(self, path, fourcc):
+        """Return a video writer of the size of the renderer, or raise an
+        OSError if the video cannot be written, for example when the codec
+        is not available."""
+        code = cv2.VideoWriter_fourcc(*fourcc)
+        writer = cv2.VideoWriter(path, code, self.framerate, frameSize=self.size)
+        if not writer.isOpened():
+            raise OSError(f"The video {path} cannot be written with the codec {fourcc}.")
+        return writer
+
+    def renderRange(self, filename, start, stop, path):
+        """Render the steps from start to stop into the chunk at the path,
+        starting directly at the step start."""
+        fourier = self.createFourier(filename)
+        fourier.seek(start)
+        window = fourier.context.draw.window
+        writer = self.createWriter(path, self.chunk_fourcc)
+        for step in range(start, stop):
+            fourier.main()
+            fourier.show()
+            writer.write(cv2.cvtColor(window.raster, cv2.COLOR_RGB2BGR))
+        writer.release()
+        return path
+
+    def concatenate(self, chunks, output):
+        """Write the frames of the chunks in order into the output video, whose
+        codec is given by its extension, then remove the chunks."""
+        extension = os.path.splitext(output)[1][1:]
+        writer = self.createWriter(output, Camera.fourccs[extension])
+        for chunk in chunks:
+            capture = cv2.VideoCapture(chunk)
+            while True:
+                read, frame = capture.read()
+                if not read:
+                    break
+                writer.write(frame)
+            capture.release()
+            os.remove(chunk)
+        writer.release()
+
+
+def main(args=None):
+    """Render the coefficients file given in the command line into a video."""
+    parser = argparse.ArgumentParser(
+        description="Render the construction of a coefficients file into a video."
+    )
+    parser.add_argument("filename", help="coefficients file of the directory")
+    parser.add_argument("output", help="video file, .mp4 or .avi")
+    parser.add_argument("-d", "--directory", default="FourierObjects")
+    parser.add_argument("-s", "--size", type=int, nargs=2, default=(1280, 720))
+    parser.add_argument("-n", "--steps", type=int, default=1000)
+    parser.add_argument("-r", "--framerate", type=float, default=30)
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("--hide-sample", action="store_true")
+    args = parser.parse_args(args)
+    attributes = {"show_sample": False} if args.hide_sample else {}
+    renderer = VideoRenderer(
+        args.directory,
+        args.size,
+        args.steps,
+        args.framerate,
+        args.workers,
+        attributes=attributes,
+    )
+    t = time.perf_counter()
+    renderer(args.filename, args.output)
+    print(f"{args.output} in {time.perf_counter() - t:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import numpy as np
+import pygame
+import math
+
+
+class EpicycleRenderer:
+    """Draw the vectors and the circles of the epicycles from the array of the
+    positions of their joints, converted to the screen in a single vectorized
+    pass, without creating any Vector or Circle object.
+    The epicycles smaller than a threshold in pixels or outside of the view
+    are not drawn, their vectors being collapsed into the next ones."""
+
+    def __init__(self, arrow=(0.1, 0.5), arrows=True, width=1, threshold=1):
+        """Create a renderer using the arrowheads proportion of the vectors and
+        angle in radians, whether the arrowheads are drawn, the width and the
+        radius in pixels under which the epicycles are not drawn."""
+        self.arrow = arrow
+        self.arrows = arrows
+        self.width = width
+        self.threshold = threshold
+        self.view = None
+
+    def update(self, context):
+        """Update the scale, the minimum length and the corners of the view in
+        the plane when the view changed, by zooming or moving."""
+        plane, window = context.draw.plane, context.draw.window
+        view = plane.getView(window)
+        if view == self.view:
+            return
+        self.view = view
+        ux, uy = plane.units
+        self.scale = (ux + uy) / 2  # Pixels per unit of the plane
+        self.minimum_length = self.threshold / self.scale
+        self.corners = plane.getCorners(window)
+
+    def getVisible(self, centers, radii):
+        """Return the mask of the circles which intersect the view."""
+        xmin, ymin, xmax, ymax = self.corners
+        x, y = centers[:, 0], centers[:, 1]
+        return (
+            (x + radii >= xmin)
+            & (x - radii <= xmax)
+            & (y + radii >= ymin)
+            & (y - radii <= ymax)
+        )
+
+    def getLevelOfDetail(self, joints):
+        """Return the lengths of the vectors between the joints and the masks of
+        the vectors large enough and of the vectors which are visible."""
+        lengths = np.hypot(*(joints[1:] - joints[:-1]).T)
+        large = lengths >= self.minimum_length
+        return lengths, large, large & self.getVisible(joints[:-1], lengths)
+
+    def toScreen(self, context, joints):
+        """Return the joints on the screen as an array."""
+        return context.draw.plane.getAllToScreen(joints, context.draw.window)
+
+    def getArrowheads(self, starts, ends):
+        """Return the 2 ends of the arrowheads of the vectors from the starts to
+        the ends in the plane, as 2 arrays of shape (n, 2)."""
+        proportion, angle = self.arrow
+        back = (starts - ends) * proportion
+        c, s = math.cos(angle), math.sin(angle)
+        rotation = np.array([[c, s], [-s, c]])  # Rotates the rows by angle
+        return ends + back @ rotation, ends + back @ rotation.T
+
+    def drawVectors(self, context, joints, color):
+        """Draw the vectors between the successive joints."""
+        if len(joints) < 2:
+            return
+        self.update(context)
+        joints = np.asarray(joints, dtype=float).reshape(-1, 2)
+        lengths, large, visible = self.getLevelOfDetail(joints)
+        # The small vectors are collapsed into the next large one,
+        # the last joint is kept as it is the end of the drawing
+        kept = np.concatenate(([True], large))
+        kept[-1] = True
+        surface = context.screen
+        screen = self.toScreen(context, joints[kept])
+        if len(screen) > 1:
+            pygame.draw.lines(surface, color, False, screen, self.width)
+        if not self.arrows or not visible.any():
+            return
+        ends = joints[1:][visible]
+        left, right = self.getArrowheads(joints[:-1][visible], ends)
+        n = len(ends)
+        points = self.toScreen(context, np.concatenate((left, ends, right)))
+        for l, q, r in zip(
+            points[:n].tolist(), points[n : 2 * n].tolist(), points[2 * n :].tolist()
+        ):
+            pygame.draw.lines(surface, color, False, (l, q, r), self.width)
+
+    def drawCircles(self, context, joints, color):
+        """Draw the circles centered on each joint passing through the next one."""
+        if len(joints) < 2:
+            return
+        self.update(context)
+        joints = np.asarray(joints, dtype=float).reshape(-1, 2)
+        lengths, large, visible = self.getLevelOfDetail(joints)
+        centers = self.toScreen(context, joints[:-1][visible])
+        radii = np.maximum((lengths[visible] * self.scale).astype(int), 1)
+        surface = context.screen
+        for center, radius in zip(centers.tolist(), radii.tolist()):
+            pygame.draw.circle(surface, color, center, radius, self.width)
+
+
+class TrailRenderer:
+    """Draw a graph which grows at each step, like the display graph, on a
+    surface kept between the frames on which only the new segments are drawn,
+    and which is drawn again entirely only when the view of the plane changes."""
+
+    def __init__(self, width=1):
+        """Create a trail renderer using the width of the lines."""
+        self.width = width
+        self.reset()
+
+    def reset(self):
+        """Forget the surface so that the graph is drawn again entirely."""
+        self.surface = None
+        self.graph = None
+        self.view = None
+        self.color = None
+        self.length = 0
+
+    def isValid(self, context, graph, color):
+        """Determine if the surface still shows the beginning of the graph."""
+        return (
+            self.surface is not None
+            and graph is self.graph
+            and len(graph) >= self.length
+            and color == self.color
+            and self.view == context.draw.plane.getView(context.draw.window)
+            and self.surface.get_size() == context.screen.get_size()
+        )
+
+    def draw(self, context, graph, color):
+        """Draw the new segments of the graph on the surface and blit it."""
+        if not self.isValid(context, graph, color):
+            self.reset()
+            self.surface = pygame.Surface(context.screen.get_size(), pygame.SRCALPHA)
+            self.graph = graph
+            self.view = context.draw.plane.getView(context.draw.window)
+            self.color = color
+        n = len(graph)
+        # The last point drawn is the start of the new segments
+        start = max(self.length - 1, 0)
+        if n - start > 1:
+            plane, window = context.draw.plane, context.draw.window
+            screen = plane.getAllToScreen(graph[start:n], window)
+            pygame.draw.lines(self.surface, color, False, screen, self.width)
+        self.length = n
+        context.screen.blit(self.surface, (0, 0))
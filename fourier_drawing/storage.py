@@ -0,0 +1,158 @@
+from collections.abc import Mapping
+from .coefficients import CoefficientSet
+
+import numpy as np
+import struct
+import pickle
+import json
+import os
+
+magic = b"FOURIER\0"
+version = 1
+alignment = 64  # Sections start at multiples of the alignment
+
+
+class ComponentsFile(Mapping):
+    """Binary file of typed arrays, called sections, made of:
+    - the magic bytes, the version and the length of the header,
+    - a json header giving the dtype, the shape and the offset of each section,
+    - the sections, which are memory mapped only when they are read."""
+
+    @staticmethod
+    def write(path, sections, **attributes):
+        """Write the sections, a dictionary of arrays, and the attributes,
+        which must be json serializable, in the file at the path."""
+        arrays = {k: np.ascontiguousarray(v) for k, v in sections.items()}
+        header = {"attributes": attributes, "sections": {}}
+        # The offsets depend on the length of the header which depends on them
+        start = 0
+        while True:
+            offset = start
+            for name, array in arrays.items():
+                header["sections"][name] = {
+                    "dtype": array.dtype.str,
+                    "shape": list(array.shape),
+                    "offset": offset,
+                }
+                offset += -(-array.nbytes // alignment) * alignment
+            encoded = json.dumps(header).encode()
+            size = len(magic) + 8 + len(encoded)
+            needed = -(-size // alignment) * alignment
+            if needed == start:
+                break
+            start = needed
+        with open(path + ".tmp", "wb") as f:
+            f.write(magic + struct.pack("<II", version, len(encoded)) + encoded)
+            for name, array in arrays.items():
+                f.seek(header["sections"][name]["offset"])
+                f.write(array.tobytes())
+            f.truncate(offset)
+        os.replace(path + ".tmp", path)
+
+    @staticmethod
+    def isComponentsFile(path):
+        """Determine if the file at the path is a components file."""
+        with open(path, "rb") as f:
+            return f.read(len(magic)) == magic
+
+    def __init__(self, path):
+        """Open the file by reading only its header."""
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(magic)) != magic:
+                raise ValueError(path + " is not a components file.")
+            self.version, length = struct.unpack("<II", f.read(8))
+            if self.version > version:
+                raise ValueError(
+                    path + " was written by a newer version: " + str(self.version)
+                )
+            header = json.loads(f.read(length))
+        self.sections = header["sections"]
+        self.attributes = header["attributes"]
+
+    def __getitem__(self, name):
+        """Return the section as a read only memory mapped array."""
+        section = self.sections[name]
+        shape = tuple(section["shape"])
+        if 0 in shape:
+            return np.zeros(shape, dtype=section["dtype"])
+        return np.memmap(
+            self.path, section["dtype"], "r", section["offset"], shape
+        )
+
+    def __iter__(self):
+        """Iterate the names of the sections."""
+        return iter(self.sections)
+
+    def __len__(self):
+        """Return the number of sections."""
+        return len(self.sections)
+
+
+class Components(Mapping):
+    """Dictionary of the components of a VisualFourier whose entries are
+    read from a components file only when they are needed."""
+
+    def __init__(self, file):
+        """Create the components of the file."""
+        self.file = file
+
+    def __getitem__(self, key):
+        """Return the component of the given key."""
+        if key == "coefficients":
+            return CoefficientSet(self.file["frequencies"], self.file["coefficients"])
+        if key == "drawing":
+            return [tuple(p) for p in self.file["drawing"].tolist()]
+        if key == "construction":
+            return []  # The construction is computed again
+        return self.file[key]
+
+    def __iter__(self):
+        """Iterate the keys of the components."""
+        return iter(["coefficients", "drawing", "construction", "display"])
+
+    def __len__(self):
+        """Return the number of components."""
+        return 4
+
+
+def saveComponents(path, dictionary):
+    """Save the dictionary of the components of a VisualFourier."""
+    coefficients = CoefficientSet.create(dictionary["coefficients"])
+    ComponentsFile.write(
+        path,
+        {
+            "frequencies": coefficients.frequencies.astype(np.int64),
+            "coefficients": coefficients.coefficients,
+            "drawing": np.asarray(dictionary["drawing"], dtype=float).reshape(-1, 2),
+            "display": np.asarray(dictionary["display"], dtype=float).reshape(-1, 2),
+        },
+    )
+
+
+def loadComponents(path, migrate=True):
+    """Load the dictionary of the components of a VisualFourier. The legacy
+    pickled files are converted into components files if migrate is True."""
+    if ComponentsFile.isComponentsFile(path):
+        return Components(ComponentsFile(path))
+    with open(path, "rb") as f:
+        dictionary = pickle.load(f)
+    if migrate:
+        saveComponents(path, dictionary)
+    return dictionary
+
+
+def writeCoefficients(path, cfs):
+    """Write the coefficients in a text file, one 'frequency:coefficient' per line."""
+    with open(path, mode="w", encoding="utf-8") as file:
+        file.write("\n".join([f"{k}:{v}" for k, v in cfs.items()]))
+
+
+def readCoefficients(path):
+    """Read the coefficients of a text file written by writeCoefficients."""
+    with open(path, encoding="utf-8") as file:
+        lines = np.array(file.read().split())
+    if len(lines) == 0:
+        return CoefficientSet()
+    parts = np.char.partition(lines, ":")
+    return CoefficientSet(parts[:, 0].astype(int), parts[:, 2].astype(complex))
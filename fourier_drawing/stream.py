@@ -0,0 +1,285 @@
+from .context import Context
+from .contours import ContourExtractor
+from .transform import Fourier
+from .tracking import CoefficientTracker
+from .renderer import EpicycleRenderer
+from . import colors
+
+import argparse
+import threading
+import queue
+import time
+import cv2
+
+
+class Stage(threading.Thread):
+    """Worker of a pipeline which applies its function to the items of its
+    input queue, or produces the items if it has no input, and offers the
+    results to its output queue. When the output queue is full its oldest item
+    is dropped, so that the pipeline stays in real time."""
+
+    end = None  # Item closing the queues
+
+    def __init__(self, name, function, input=None, output=None, period=0):
+        """Create a stage using its name, its function, its input and output
+        queues and the optional minimum duration between 2 items produced."""
+        super().__init__(name=name, daemon=True)
+        self.function = function
+        self.input = input
+        self.output = output
+        self.period = period
+        self.running = True
+        self.count = 0
+        self.busy = 0  # Total duration of the function
+        self.dropped = 0
+        self.start_time = time.perf_counter()
+
+    def run(self):
+        """Process the items until the end of the input or until stopped."""
+        self.start_time = next_time = time.perf_counter()
+        while self.running:
+            if self.input is None:
+                t = timestamp = time.perf_counter()
+                value = self.function()
+                if value is None:
+                    break
+            else:
+                try:
+                    item = self.input.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is Stage.end:
+                    break
+                timestamp, value = item
+                t = time.perf_counter()
+                value = self.function(value)
+            self.busy += time.perf_counter() - t
+            self.count += 1
+            if value is not None:
+                self.offer((timestamp, value))
+            if self.period:
+                next_time += self.period
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_time = time.perf_counter()
+        self.offer(Stage.end)
+
+    def offer(self, item):
+        """Put the item in the output queue, dropping its oldest item if it is full."""
+        while True:
+            try:
+                self.output.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.output.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def stop(self):
+        """Stop the stage after its current item."""
+        self.running = False
+
+    def getThroughput(self):
+        """Return the number of items processed per second."""
+        return self.count / max(time.perf_counter() - self.start_time, 1e-9)
+
+    def getLatency(self):
+        """Return the mean duration of the function per item in seconds."""
+        return self.busy / max(self.count, 1)
+
+    def report(self):
+        """Return the statistics of the stage as a text."""
+        return (
+            f"{self.name}: {self.getThroughput():.1f}/s, "
+            f"{1000 * self.getLatency():.1f}ms, {self.dropped} dropped"
+        )
+
+    throughput = property(getThroughput)
+    latency = property(getLatency)
+
+
+class StreamFourier:
+    """Draw in real time the epicycles of the dominant contour of the frames of
+    a video file or of a camera. The capture, the extraction of the contours
+    and the transform run in threads connected by bounded queues, the frames
+    are rendered by the main loop at the frame rate of the source."""
+
+    def __init__(
+        self,
+        context,
+        source=0,
+        coefficients_number=101,
+        display_number=500,
+        period=60,
+        extractor=None,
+        queue_size=2,
+        tracker=None,
+        transition=5,
+    ):
+        """Create a stream using the context, the index of the camera or the
+        path of the video, the number of coefficients, the number of points of
+        the display graph, the number of frames of a turn of the epicycles, the
+        contour extractor, the size of the queues, the coefficient tracker and
+        the number of frames of the interpolation between 2 keyframes."""
+        if extractor is None:
+            extractor = ContourExtractor(max_contours=1)
+        if tracker is None:
+            tracker = CoefficientTracker(coefficients_number)
+        self.context = context
+        self.capture = cv2.VideoCapture(source)
+        framerate = self.capture.get(cv2.CAP_PROP_FPS)
+        self.framerate = framerate if framerate > 0 else 30
+        self.coefficients_number = coefficients_number
+        self.display_number = display_number
+        self.period = period
+        self.extractor = extractor
+        self.tracker = tracker
+        self.transition = transition
+        self.renderer = EpicycleRenderer()
+        self.frames = queue.Queue(queue_size)
+        self.contours = queue.Queue(queue_size)
+        self.coefficients = queue.Queue(queue_size)
+        self.stages = [
+            Stage("capture", self.read, output=self.frames, period=1 / self.framerate),
+            Stage("extraction", self.extract, self.frames, self.contours),
+            Stage("transform", self.transform, self.contours, self.coefficients),
+        ]
+        self.step = 0
+        self.current = None  # Latest coefficients and their display graph
+        self.previous = None  # Coefficients shown when the latest ones were received
+        self.change_step = 0
+        self.rendered = 0
+        self.render_time = 0
+        self.delay = 0  # Total delay between the capture and the first render
+
+    def read(self):
+        """Return the next frame of the source, or None at its end."""
+        read, frame = self.capture.read()
+        return frame if read else None
+
+    def extract(self, frame):
+        """Return the dominant contour of the frame, or None."""
+        contours = self.extractor(frame)
+        return contours[0] if contours else None
+
+    def transform(self, contour):
+        """Return the coefficients of the contour aligned with the previous
+        ones, which are reused if the contour barely changed."""
+        return self.tracker.update(contour)
+
+    def __call__(self, frames=None):
+        """Run the stream until the end of the source, the window is closed or
+        the number of frames is rendered. Return the report of the stages."""
+        for stage in self.stages:
+            stage.start()
+        start = time.perf_counter()
+        ended = False
+        while self.context.open and not ended:
+            if frames is not None and self.step >= frames:
+                break
+            self.context.check()
+            ended = self.receive()
+            t = time.perf_counter()
+            self.show()
+            self.render_time += time.perf_counter() - t
+            self.step += 1
+            # The frames are rendered at the frame rate of the source
+            delay = start + self.step / self.framerate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        self.stop()
+        return self.report()
+
+    def receive(self):
+        """Take the latest coefficients computed. Return True at the end."""
+        while True:
+            try:
+                item = self.coefficients.get_nowait()
+            except queue.Empty:
+                return False
+            if item is Stage.end:
+                return True
+            timestamp, coefficients = item
+            if self.current is None or coefficients is not self.current[0]:
+                self.previous = self.getShown()
+                self.change_step = self.step
+                display = Fourier.inverseTransform(coefficients, self.display_number)
+                self.current = (coefficients, display)
+            self.delay += time.perf_counter() - timestamp
+            self.rendered += 1
+
+    def getShown(self):
+        """Return the coefficients shown and their display graph, or None.
+        During the transition they are interpolated from the previous ones to
+        the latest ones."""
+        if self.current is None:
+            return None
+        s = (self.step - self.change_step) / self.transition if self.transition else 1
+        if self.previous is None or s >= 1:
+            return self.current
+        coefficients = self.tracker.interpolate(self.previous[0], self.current[0], s)
+        display = Fourier.inverseTransform(coefficients, self.display_number)
+        return coefficients, display
+
+    def show(self):
+        """Show the epicycles of the latest coefficients."""
+        self.context.clear()
+        self.context.show()
+        shown = self.getShown()
+        if shown:
+            coefficients, display = shown
+            draw = self.context.draw
+            draw.lines(self.context.screen, colors.RED, display, True)
+            t = (self.step % self.period) / self.period
+            joints = Fourier.build(coefficients, t)[1:]
+            self.renderer.drawCircles(self.context, joints, colors.GREY)
+            self.renderer.drawVectors(self.context, joints, colors.WHITE)
+        self.context.flip()
+
+    def stop(self):
+        """Stop the stages and release the source."""
+        for stage in self.stages:
+            stage.stop()
+        for stage in self.stages:
+            stage.join()
+        self.capture.release()
+
+    def report(self):
+        """Return the statistics of the stages as a text."""
+        lines = [stage.report() for stage in self.stages]
+        lines.append(self.tracker.report())
+        render = self.render_time / max(self.step, 1)
+        delay = self.delay / max(self.rendered, 1)
+        lines.append(f"render: {self.step} frames, {1000 * render:.1f}ms")
+        lines.append(f"latency: {1000 * delay:.1f}ms for {self.rendered} contours")
+        return "\n".join(lines)
+
+
+def main(args=None):
+    """Stream the video file or the camera given in the command line."""
+    parser = argparse.ArgumentParser(
+        description="Draw in real time the epicycles of the contours of a video."
+    )
+    parser.add_argument("source", nargs="?", default="0", help="video file or camera index")
+    parser.add_argument("-n", "--coefficients", type=int, default=101)
+    parser.add_argument("-p", "--period", type=int, default=60)
+    parser.add_argument("-s", "--size", type=int, nargs=2, default=None)
+    parser.add_argument("-t", "--threshold", type=float, default=0.02)
+    args = parser.parse_args(args)
+    source = int(args.source) if args.source.isdigit() else args.source
+    context = Context(name="Fourier stream", size=args.size)
+    w, h = context.draw.window.size
+    context.draw.plane.units = [0.8 * min(w, h)] * 2  # The contours are of size 1
+    tracker = CoefficientTracker(args.coefficients, args.threshold)
+    stream = StreamFourier(
+        context, source, args.coefficients, period=args.period, tracker=tracker
+    )
+    print(stream())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import numpy as np
+import math
+import time
+
+
+class Grid:
+    """Uniform grid of cells indexing points to find quickly the nearest ones.
+    Points can be removed from the grid."""
+
+    def __init__(self, points, cell=None):
+        """Create the grid of the points using the optional size of the cells,
+        which is chosen so that there are about 2 points per cell by default."""
+        self.points = np.asarray(points, dtype=float).reshape(-1, 2)
+        n = len(self.points)
+        self.minimum = self.points.min(axis=0) if n else np.zeros(2)
+        if cell is None:
+            extent = np.ptp(self.points, axis=0).max() if n else 1
+            cell = extent / max(1, math.sqrt(n / 2)) or 1
+        self.cell = cell
+        self.alive = np.ones(n, dtype=bool)
+        self.remaining = n
+        self.cells = {}
+        keys = self.getKeys(self.points)
+        for i, key in enumerate(map(tuple, keys.tolist())):
+            self.cells.setdefault(key, []).append(i)
+
+    def getKeys(self, points):
+        """Return the keys of the cells of the points."""
+        return np.floor((points - self.minimum) / self.cell).astype(int)
+
+    def remove(self, i):
+        """Remove the point i from the grid."""
+        if self.alive[i]:
+            self.alive[i] = False
+            self.remaining -= 1
+
+    def ring(self, key, r):
+        """Iterate the keys of the cells at the distance r of the cell key."""
+        x, y = key
+        if r == 0:
+            yield key
+            return
+        for dx in range(-r, r + 1):
+            yield (x + dx, y - r)
+            yield (x + dx, y + r)
+        for dy in range(-r + 1, r):
+            yield (x - r, y + dy)
+            yield (x + r, y + dy)
+
+    def nearest(self, point, rings=8):
+        """Return the index of the nearest point still in the grid or None.
+        The rings of cells around the point are searched first, if nothing is
+        found within 'rings' rings all the remaining points are compared."""
+        if self.remaining == 0:
+            return None
+        point = np.asarray(point, dtype=float)
+        key = tuple(self.getKeys(point).tolist())
+        best, best_distance = None, math.inf
+        for r in range(rings + 1):
+            # The points of the ring r are at least at (r-1) cells
+            if best is not None and best_distance <= (r - 1) * self.cell:
+                return best
+            for cell in self.ring(key, r):
+                indices = self.cells.get(cell)
+                if not indices:
+                    continue
+                indices[:] = [i for i in indices if self.alive[i]]
+                for i in indices:
+                    d = math.dist(point, self.points[i])
+                    if d < best_distance:
+                        best, best_distance = i, d
+        if best is not None and best_distance <= rings * self.cell:
+            return best
+        indices = np.flatnonzero(self.alive)
+        distances = np.hypot(*(self.points[indices] - point).T)
+        return int(indices[np.argmin(distances)])
+
+    def neighbours(self, point, r=1):
+        """Return the indices of the points of the cells within r cells of the point."""
+        key = tuple(self.getKeys(np.asarray(point, dtype=float)).tolist())
+        indices = []
+        for k in range(r + 1):
+            for cell in self.ring(key, k):
+                indices += self.cells.get(cell, [])
+        return indices
+
+
+class TourBuilder:
+    """Order the contours of an image, or isolated points, into a single
+    closed tour with short jumps between them, so that it can be drawn with
+    a single stroke."""
+
+    def __init__(self, improvement_time=0, rings=8):
+        """Create a tour builder using the optional duration in seconds of the
+        2-opt improvement of the tour and the number of rings of cells searched
+        before comparing all the points."""
+        self.improvement_time = improvement_time
+        self.rings = rings
+
+    def __call__(self, contours):
+        """Return the tour of the contours as an array of shape (n, 2)."""
+        tour = self.chain(contours)
+        if self.improvement_time > 0 and len(tour) > 3:
+            tour = self.improve(tour, self.improvement_time)
+        return tour
+
+    def order(self, points):
+        """Return the tour of isolated points using the nearest neighbours."""
+        points = np.asarray(points, dtype=float).reshape(-1, 1, 2)
+        return self(list(points))
+
+    def chain(self, contours):
+        """Chain the contours by going each time to the nearest end of the
+        contours left, starting with the longest contour."""
+        contours = [np.asarray(c, dtype=float).reshape(-1, 2) for c in contours]
+        contours = [c for c in contours if len(c)]
+        if not contours:
+            return np.zeros((0, 2))
+        ends = np.array([[c[0], c[-1]] for c in contours]).reshape(-1, 2)
+        grid = Grid(ends)  # The ends 2i and 2i+1 are the ends of the contour i
+        first = max(range(len(contours)), key=lambda i: len(contours[i]))
+        grid.remove(2 * first)
+        grid.remove(2 * first + 1)
+        tour = [contours[first]]
+        while grid.remaining:
+            end = grid.nearest(tour[-1][-1], self.rings)
+            i = end // 2
+            grid.remove(2 * i)
+            grid.remove(2 * i + 1)
+            # The contour is reversed when its nearest end is its last point
+            tour.append(contours[i][::-1] if end % 2 else contours[i])
+        return np.concatenate(tour)
+
+    def length(self, tour):
+        """Return the length of the closed tour."""
+        return np.sum(np.hypot(*(np.roll(tour, -1, axis=0) - tour).T))
+
+    def improve(self, tour, duration):
+        """Improve the tour using 2-opt moves on its longest edges, until no
+        move is found or the duration in seconds is elapsed."""
+        end = time.perf_counter() + duration
+        tour = np.array(tour, dtype=float)
+        n = len(tour)
+        grid = Grid(tour)  # Indexes the points, whose positions in the tour change
+        order = np.arange(n)  # Points of the tour
+        position = np.arange(n)  # Position of the points in the tour
+        improved = True
+        while improved and time.perf_counter() < end:
+            improved = False
+            points = tour[order]
+            lengths = np.hypot(*(np.roll(points, -1, axis=0) - points).T)
+            threshold = 2 * np.median(lengths)
+            starts = order.copy()
+            for k in np.argsort(-lengths):
+                if lengths[k] <= threshold or time.perf_counter() >= end:
+                    break
+                a = starts[k]
+                i = position[a]
+                b = order[(i + 1) % n]
+                ab = math.dist(tour[a], tour[b])
+                best, best_gain = None, 1e-12
+                for c in grid.neighbours(tour[a], 2):
+                    j = position[c]
+                    d = order[(j + 1) % n]
+                    if j == i or c == b or d == a:
+                        continue
+                    gain = (
+                        ab
+                        + math.dist(tour[c], tour[d])
+                        - math.dist(tour[a], tour[c])
+                        - math.dist(tour[b], tour[d])
+                    )
+                    if gain > best_gain:
+                        best, best_gain = j, gain
+                if best is None:
+                    continue
+                # Reversing the path from b to c replaces ab and cd by ac and bd
+                start, stop = sorted((i, best))
+                segment = order[start + 1 : stop + 1][::-1].copy()
+                order[start + 1 : stop + 1] = segment
+                position[segment] = np.arange(start + 1, stop + 1)
+                improved = True
+        return tour[order]
@@ -0,0 +1,137 @@
+from .coefficients import CoefficientSet
+from .transform import Fourier
+
+import numpy as np
+import math
+
+
+class CoefficientTracker:
+    """Compute temporally coherent coefficients for the successive contours of
+    a video. The start point and the direction of each contour are arbitrary,
+    so the coefficients of a frame are shifted in phase to match those of the
+    previous one, which keeps the epicycles from jumping. A contour which
+    barely changed since the last keyframe reuses its coefficients, so that
+    the expensive transform only runs on the keyframes, and the coefficients
+    between the keyframes can be interpolated.
+    It does not rely on pygame so it can run without any window."""
+
+    def __init__(
+        self,
+        coefficients_number=101,
+        threshold=0.02,
+        descriptor_number=15,
+        resolution=1024,
+        wo=2 * math.pi,
+    ):
+        """Create a tracker using the number of coefficients, the relative
+        change of a contour under which the coefficients are reused, the
+        number of coefficients of the cheap descriptor of the contours
+        compared, the number of start points tried by the alignment and the
+        pulsation of the coefficients."""
+        self.coefficients_number = coefficients_number
+        self.threshold = threshold
+        self.descriptor_number = descriptor_number
+        self.resolution = resolution
+        self.wo = wo
+        self.reset()
+
+    def reset(self):
+        """Forget the last keyframe, so that the next contour is transformed."""
+        self.coefficients = None
+        self.descriptor = None
+        self.keyframes = 0
+        self.reused = 0
+
+    def shift(self, cfs, t):
+        """Return the coefficients of the same curve starting at the time t."""
+        n, cns = Fourier.toArrays(cfs)
+        return CoefficientSet(n, cns * np.exp(1j * self.wo * n * t))
+
+    def reverse(self, cfs):
+        """Return the coefficients of the same curve drawn backwards."""
+        n, cns = Fourier.toArrays(cfs)
+        return CoefficientSet(-n, cns)
+
+    def correlate(self, cfs, reference):
+        """Return the time of the start point of the curve which matches best
+        the reference and the correlation at this time.
+        The correlation of the curves for all the start points is the inverse
+        transform of their cross-spectrum, computed on a uniform grid."""
+        n, cns = Fourier.toArrays(cfs)
+        spectrum = np.zeros(self.resolution, dtype=complex)
+        np.add.at(spectrum, n % self.resolution, cns * np.conj(np.asarray(reference)))
+        correlation = np.fft.ifft(spectrum).real
+        k = int(np.argmax(correlation))
+        return k / self.resolution, correlation[k]
+
+    def align(self, cfs, reference):
+        """Return the coefficients shifted, and reversed if needed, to match
+        the reference coefficients of the same frequencies."""
+        cfs = CoefficientSet.create(cfs)
+        candidates = [cfs, self.reverse(cfs)]
+        correlations = [self.correlate(c, reference) for c in candidates]
+        i = int(np.argmax([c for t, c in correlations]))
+        return self.shift(candidates[i], correlations[i][0])
+
+    def distance(self, cfs, reference):
+        """Return the mean distance between the curves of the coefficients
+        relatively to the size of the reference, by Parseval's theorem."""
+        difference = np.linalg.norm(np.asarray(cfs) - np.asarray(reference))
+        return difference / max(np.linalg.norm(np.asarray(reference)), 1e-12)
+
+    def describe(self, contour):
+        """Return the cheap descriptor of the contour, its first coefficients."""
+        return Fourier.transform(contour, self.descriptor_number)
+
+    def transform(self, contour):
+        """Return the coefficients of the contour."""
+        return Fourier.polygonTransform(contour, self.coefficients_number, self.wo)
+
+    def update(self, contour):
+        """Return the coefficients of the next contour, which are those of the
+        last keyframe if the contour barely changed, otherwise those of the
+        contour aligned with the last keyframe, which becomes the contour."""
+        descriptor = self.describe(contour)
+        if self.descriptor is not None:
+            descriptor = self.align(descriptor, self.descriptor)
+            if self.distance(descriptor, self.descriptor) < self.threshold:
+                self.reused += 1
+                return self.coefficients
+        cfs = self.transform(contour)
+        if self.coefficients is not None:
+            cfs = self.align(cfs, self.coefficients)
+        self.coefficients = cfs
+        self.descriptor = descriptor
+        self.keyframes += 1
+        return cfs
+
+    def interpolate(self, cfs1, cfs2, s):
+        """Return the coefficients between those of the same frequencies at
+        the proportion s from the first to the second."""
+        n, cns1 = Fourier.toArrays(cfs1)
+        return CoefficientSet(n, cns1 + s * (np.asarray(cfs2) - cns1))
+
+    def track(self, contours, interval=1):
+        """Return the coefficients of all the contours, only the contours
+        every 'interval' frames and the last one being keyframes candidates,
+        the coefficients of the others being interpolated."""
+        if not len(contours):
+            return []
+        keys = list(range(0, len(contours), interval))
+        if keys[-1] != len(contours) - 1:
+            keys.append(len(contours) - 1)
+        keyframes = [self.update(contours[i]) for i in keys]
+        tracked = [keyframes[0]]
+        for i in range(1, len(keys)):
+            start, stop = keys[i - 1], keys[i]
+            cfs1, cfs2 = keyframes[i - 1], keyframes[i]
+            for j in range(start + 1, stop):
+                s = (j - start) / (stop - start)
+                tracked.append(cfs1 if cfs1 is cfs2 else self.interpolate(cfs1, cfs2, s))
+            tracked.append(cfs2)
+        return tracked
+
+    def report(self):
+        """Return the counters of the tracker as a text."""
+        total = self.keyframes + self.reused
+        return f"tracking: {self.keyframes} keyframes, {self.reused} reused of {total}"
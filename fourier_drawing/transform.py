@@ -0,0 +1,277 @@
+from .coefficients import CoefficientSet
+
+import numpy as np
+import math
+
+
+class Fourier:
+    def toComplex(pts):
+        """Return the points as a one dimensional array of complex numbers."""
+        if isinstance(pts, np.ndarray):
+            if np.iscomplexobj(pts):
+                return pts.ravel()
+            pts = np.asarray(pts, dtype=float).reshape(-1, 2)
+            return pts[:, 0] + 1j * pts[:, 1]
+        return np.array([complex(*pt) for pt in pts], dtype=complex)
+
+    def transform(pts, ncfs, wo=2 * math.pi):
+        """Apply the true fourier transform by
+        returning the set of the coefficients.
+        The coefficients are computed with a fast fourier transform, if more
+        coefficients than points are asked, the spectrum is padded with zeros,
+        if less are asked it is truncated around the frequency 0."""
+        if wo != 2 * math.pi:
+            return Fourier.directTransform(pts, ncfs, wo)
+        z = Fourier.toComplex(pts)
+        npts = len(z)
+        h = ncfs // 2
+        n = np.arange(-h, h + 1)
+        spectrum = np.fft.fft(z) / npts
+        cns = np.zeros(len(n), dtype=complex)
+        # Frequencies above the nyquist frequency of the sample are padded
+        kept = np.abs(n) <= npts // 2
+        cns[kept] = spectrum[n[kept] % npts]
+        return CoefficientSet(n, cns)
+
+    def directTransform(pts, ncfs, wo=2 * math.pi):
+        """Apply the fourier transform by computing directly the sum of each
+        coefficient, which works for any pulsation 'wo'."""
+        z = Fourier.toComplex(pts)
+        npts = len(z)
+        h = ncfs // 2
+        n = np.arange(-h, h + 1)
+        w = np.arange(npts) / npts  # w is not a frequency but the variable of a parametric equation
+        cns = np.exp(-1j * wo * np.outer(n, w)) @ z / npts
+        return CoefficientSet(n, cns)
+
+    def polygonTransform(pts, ncfs, wo=2 * math.pi, durations=None, block=2 ** 20):
+        """Apply the fourier transform to the closed polygon of the points by
+        integrating exactly each segment, instead of sampling it.
+        The segment from the point k to the point k+1 lasts durations[k],
+        the last segment closes the polygon, by default they all last the same."""
+        z = Fourier.toComplex(pts)
+        nseg = len(z)
+        if durations is None:
+            durations = np.ones(nseg)
+        durations = np.asarray(durations, dtype=float)
+        t = np.concatenate(([0], np.cumsum(durations))) / np.sum(durations)
+        a = z  # Start of the segments
+        b = np.roll(z, -1)  # End of the segments
+        moving = durations > 0
+        s = np.zeros(nseg, dtype=complex)  # Speed of the segments
+        s[moving] = (b - a)[moving] / np.diff(t)[moving]
+        h = ncfs // 2
+        n = np.arange(-h, h + 1)
+        cns = np.empty(len(n), dtype=complex)
+        # The integral of (a+s(t-tk))exp(-iwt) over [tk,tk+1] is
+        # i/w(b.exp(-iwtk+1)-a.exp(-iwtk)) + s/w**2(exp(-iwtk+1)-exp(-iwtk))
+        step = max(1, block // (nseg + 1))
+        for i in range(0, len(n), step):
+            w = wo * n[i : i + step]
+            e = np.exp(-1j * np.outer(w, t))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                c = 1j / w * (e[:, 1:] @ b - e[:, :-1] @ a)
+                c += (e[:, 1:] - e[:, :-1]) @ s / w ** 2
+            cns[i : i + step] = c
+        cns[n == 0] = np.sum((a + b) / 2 * np.diff(t))
+        return CoefficientSet(n, cns)
+
+    def truncate(cfs, energy=None, error=None, count=None):
+        """Keep the smallest set of coefficients with the largest magnitudes that
+        contains the given fraction of the energy of the curve (by Parseval's
+        theorem) and whose reconstruction error is less than the given error,
+        with at most 'count' coefficients.
+        Return the truncated coefficients and a report of the achieved error."""
+        cfs = CoefficientSet.create(cfs)
+        magnitudes = np.abs(cfs.coefficients)
+        indices = np.argsort(-magnitudes, kind="stable")
+        magnitudes = magnitudes[indices]
+        energies = np.cumsum(magnitudes ** 2)
+        total = energies[-1] if len(energies) else 0
+        # The maximum error is bounded by the sum of the magnitudes left out
+        errors = np.cumsum(magnitudes[::-1])[::-1]
+        errors = np.append(errors, 0)
+        kept = len(cfs) if count is None else min(count, len(cfs))
+        if energy is not None or error is not None:
+            needed = 0
+            if energy is not None and total > 0:
+                needed = np.searchsorted(energies, energy * total * (1 - 1e-12)) + 1
+            if error is not None:
+                needed = max(needed, np.argmax(errors <= error))
+            kept = min(kept, needed)
+        retained = energies[kept - 1] if kept else 0
+        report = {
+            "count": int(kept),
+            "energy": float(retained / total) if total else 1.0,
+            "rms": float(math.sqrt(max(total - retained, 0))),
+            "max": float(errors[kept]),
+        }
+        return cfs.select(np.sort(indices[:kept])), report
+
+    def toArrays(cfs):
+        """Return the frequencies and the coefficients as numpy arrays, the
+        coefficients being a coefficient set or a dictionary."""
+        return CoefficientSet.create(cfs).numpy
+
+    def inverseTransform(cfs, npts, wo=2 * math.pi, threshold=2 ** 16):
+        """Apply the true fourier inverse transform
+        by returning the array of the points.
+        If 'npts' is a number the series is evaluated on a uniform grid, using an
+        inverse fast fourier transform when the grid is large, otherwise 'npts'
+        is considered as the array of the parameters of the points."""
+        if not np.isscalar(npts):
+            return Fourier.evaluate(cfs, npts, wo)
+        t = np.arange(npts) / npts  # t is not a time but the variable of a parametric equation of the final graph
+        if wo != 2 * math.pi or npts * len(cfs) < threshold:
+            return Fourier.evaluate(cfs, t, wo)
+        n, cns = Fourier.toArrays(cfs)
+        # Coefficients whose frequencies are equal modulo npts are merged
+        spectrum = np.zeros(npts, dtype=complex)
+        np.add.at(spectrum, n % npts, cns)
+        zpts = np.fft.ifft(spectrum) * npts
+        return zpts.view(float).reshape(-1, 2)
+
+    def evaluate(cfs, t, wo=2 * math.pi, block=2 ** 18):
+        """Return the array of the points of the series evaluated for each
+        parameter of the array 't', which does not have to be uniform."""
+        n, cns = Fourier.toArrays(cfs)
+        t = np.asarray(t, dtype=float).ravel()
+        zpts = np.empty(len(t), dtype=complex)
+        # The matrix of the phasors is computed by blocks to bound the memory
+        step = max(1, block // max(1, len(n)))
+        for i in range(0, len(t), step):
+            phasors = np.exp(1j * wo * np.outer(t[i : i + step], n))
+            zpts[i : i + step] = phasors @ cns
+        return zpts.view(float).reshape(-1, 2)
+
+    def order(cfs):
+        """Return the frequencies and the coefficients in the order of the
+        epicycles: 0, 1, -1, 2, -2, ..."""
+        n, cns = Fourier.toArrays(cfs)
+        indices = np.lexsort((-n, np.abs(n)))
+        return n[indices], cns[indices]
+
+    def build(cfs, t, wo=2 * math.pi):
+        """Return the 'construction graph' with a given time 't'."""
+        return Fourier.buildFrames(cfs, [t], wo)[0]
+
+    def buildFrames(cfs, t, wo=2 * math.pi):
+        """Return the array of the 'construction graphs' for each time of the
+        array 't', of shape (len(t), len(cfs) + 1, 2)."""
+        n, cns = Fourier.order(cfs)
+        t = np.asarray(t, dtype=float).ravel()
+        frames = np.zeros((len(t), len(n) + 1), dtype=complex)
+        np.multiply(np.exp(1j * wo * np.outer(t, n)), cns, out=frames[:, 1:])
+        np.cumsum(frames[:, 1:], axis=1, out=frames[:, 1:])
+        return frames.view(float).reshape(len(t), len(n) + 1, 2)
+
+
+class EpicycleFrames:
+    """Table of the 'construction graphs' of all the steps of the construction.
+    The whole table is computed at once, unless a chunk is given, in which case
+    the frames are computed by blocks of 'chunk' frames when they are needed."""
+
+    def __init__(self, cfs, nframes, period=None, wo=2 * math.pi, chunk=None, blocks=2):
+        """Create the table of 'nframes' frames, the frame 'i' being at the time
+        'i/period'."""
+        if period is None:
+            period = nframes
+        self.cfs = cfs
+        self.nframes = nframes
+        self.period = period
+        self.wo = wo
+        self.chunk = chunk or nframes
+        self.blocks = blocks  # Number of blocks kept in memory
+        self.cache = {}
+        if self.chunk >= nframes:
+            self.cache[0] = self.compute(0, nframes)
+
+    def __len__(self):
+        """Return the number of frames."""
+        return self.nframes
+
+    def __getitem__(self, i):
+        """Return the frame 'i'."""
+        if not 0 <= i < self.nframes:
+            raise IndexError("The frame " + str(i) + " does not exist.")
+        block = i // self.chunk
+        if not block in self.cache:
+            if len(self.cache) >= self.blocks:
+                del self.cache[next(iter(self.cache))]
+            start = block * self.chunk
+            self.cache[block] = self.compute(start, min(start + self.chunk, self.nframes))
+        return self.cache[block][i % self.chunk]
+
+    def compute(self, start, stop):
+        """Return the frames between start and stop."""
+        t = np.arange(start, stop) / self.period
+        return Fourier.buildFrames(self.cfs, t, self.wo)
+
+    @classmethod
+    def createFromMemory(cls, cfs, nframes, memory, **kwargs):
+        """Create the frames in blocks that fit in the given memory in bytes."""
+        size = 16 * (len(cfs) + 1)  # Size of a single frame
+        return cls(cfs, nframes, chunk=max(1, memory // size), **kwargs)
+
+    def getTable(self):
+        """Return the whole table of the frames."""
+        if len(self.cache) == 1 and self.chunk >= self.nframes:
+            return self.cache[0]
+        return self.compute(0, self.nframes)
+
+    table = property(getTable)
+
+
+class EpicycleIntegrator:
+    """Compute the 'construction graphs' step by step by rotating each
+    coefficient with a single complex multiplication per step.
+    The rotated coefficients are computed again exactly every
+    'renormalization' steps to bound the drift of the multiplications."""
+
+    def __init__(self, cfs, nframes, period=None, wo=2 * math.pi, renormalization=256):
+        """Create the integrator of 'nframes' frames, the frame 'i' being at the
+        time 'i/period'."""
+        if period is None:
+            period = nframes
+        self.nframes = nframes
+        self.period = period
+        self.wo = wo
+        self.renormalization = renormalization
+        self.frequencies, self.cns = Fourier.order(cfs)
+        self.rotors = np.exp(1j * wo * self.frequencies / period)
+        self.joints = np.zeros(len(self.cns) + 1, dtype=complex)
+        self.seek(0)
+
+    def __len__(self):
+        """Return the number of frames."""
+        return self.nframes
+
+    def __getitem__(self, i):
+        """Return the frame 'i', which is cheap for the next frame."""
+        if not 0 <= i < self.nframes:
+            raise IndexError("The frame " + str(i) + " does not exist.")
+        if i == self.step + 1:
+            self.advance()
+        elif i != self.step:
+            self.seek(i)
+        return self.positions
+
+    def seek(self, step):
+        """Compute exactly the rotated coefficients of the given step."""
+        self.step = step
+        self.terms = self.cns * np.exp(1j * self.wo * self.frequencies * step / self.period)
+
+    def advance(self):
+        """Rotate the coefficients by one step."""
+        if (self.step + 1) % self.renormalization == 0:
+            self.seek(self.step + 1)
+        else:
+            self.step += 1
+            self.terms *= self.rotors
+
+    def getPositions(self):
+        """Return the positions of the joints of the epicycles."""
+        np.cumsum(self.terms, out=self.joints[1:])
+        return self.joints.view(float).reshape(-1, 2)
+
+    positions = property(getPositions)
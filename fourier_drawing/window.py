@@ -5,12 +5,72 @@ from pygame.locals import *
 
 import pygame
 
-pygame.init()
+from collections import OrderedDict, defaultdict
 
+import numpy as np
 import random
 import time
 
 
+class TextCache:
+    """Cache of the fonts, keyed by their name, size, boldness and italic, and
+    of the last rendered texts, keyed by their text, font and colors, so that
+    the texts shown at each frame are neither loaded nor rendered again.
+    The hits and misses are counted for profiling."""
+
+    def __init__(self, max_surfaces=256):
+        """Create a text cache using the maximum number of rendered texts kept."""
+        self.max_surfaces = max_surfaces
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.font_hits = 0
+        self.font_misses = 0
+
+    def getFont(self, name, size, bold=False, italic=False):
+        """Return the system font, loading it only the first time."""
+        key = (name, size, bold, italic)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self.fonts[key] = pygame.font.SysFont(name, size, bold, italic)
+            self.font_misses += 1
+        else:
+            self.font_hits += 1
+        return font
+
+    def render(self, text, name, size, color, background=None, bold=False, italic=False):
+        """Return the surface of the text, rendering it only if it is not cached."""
+        color = tuple(int(c) for c in color[:3])
+        if background is not None:
+            background = tuple(int(c) for c in background[:3])
+        key = (str(text), name, size, bold, italic, color, background)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        font = self.getFont(name, size, bold, italic)
+        surface = self.surfaces[key] = font.render(key[0], 1, color, background)
+        while len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Remove the rendered texts from the cache."""
+        self.surfaces.clear()
+
+    def report(self):
+        """Return the hits and misses of the cache as a text."""
+        return (
+            f"texts: {self.hits} hits, {self.misses} misses, "
+            f"fonts: {self.font_hits} hits, {self.font_misses} misses"
+        )
+
+
 class Window:
     made = 0
     draw = pygame.draw
@@ -32,9 +92,11 @@ class Window:
         background_color=BLACK,
         fullscreen=False,
         build=True,
+        headless=False,
     ):
         """Create a window object using name, size text_font, text_size,
-        text_color, background and set."""
+        text_color, background and set.
+        A headless window draws on an offscreen surface without any display."""
         Window.made += 1
         self.number = Window.made
         self.name = name
@@ -43,6 +105,8 @@ class Window:
         self.text_color = text_color
         self.background_color = background_color
         self.fullscreen = fullscreen
+        self.headless = headless
+        self.text_cache = TextCache()
         self.set()
         self.log("Window has been created.")
         if build:
@@ -59,13 +123,21 @@ class Window:
         self.counter = 0
 
     def build(self, size=None):
-        """Creates apparent window."""
-        self.events = pygame.event.get
-        self.clock = pygame.time.Clock()
-        self.info = pygame.display.Info()
-        self.font = pygame.font.SysFont(self.text_font, self.text_size)
-        self.setScreenMode(size)
-        pygame.display.set_caption(self.name)
+        """Creates apparent window, or the offscreen surface if headless."""
+        if self.headless:
+            # Only the fonts are needed, the display and the clock are not
+            pygame.font.init()
+            self.events = list
+            self.font = self.text_cache.getFont(self.text_font, self.text_size)
+            self.setScreenMode(size)
+        else:
+            pygame.init()
+            self.events = pygame.event.get
+            self.clock = pygame.time.Clock()
+            self.info = pygame.display.Info()
+            self.font = self.text_cache.getFont(self.text_font, self.text_size)
+            self.setScreenMode(size)
+            pygame.display.set_caption(self.name)
         if self.text_color is None:
             self.text_color = self.reverseColor(self.background_color)
         self.clear()
@@ -91,11 +163,19 @@ class Window:
 
     def flip(self):
         """Display on the screen the image considered."""
-        pygame.display.flip()
+        if not self.headless:
+            pygame.display.flip()
 
     def update(self):
         """Update the screen."""
-        pygame.display.update()
+        if not self.headless:
+            pygame.display.update()
+
+    def getRaster(self):
+        """Return the pixels of the screen as an array of shape (height, width, 3)."""
+        w, h = self.screen.get_size()
+        pixels = pygame.image.tobytes(self.screen, "RGB")
+        return np.frombuffer(pixels, dtype=np.uint8).reshape(h, w, 3)
 
     def screenshot(self, image=None, name=None):
         """Save an image using the image and the name.
@@ -127,7 +207,7 @@ class Window:
 
     def check(self):
         """Update window's state depending if close buttons are pressed."""
-        for event in pygame.event.get():
+        for event in self.events():
             if event.type == pygame.QUIT:
                 self.open = False
             if event.type == KEYDOWN:
@@ -145,7 +225,9 @@ class Window:
                 self.open = False
 
     def press(self):
-        """Return all keys."""
+        """Return all keys, none is pressed if the window is headless."""
+        if self.headless:
+            return defaultdict(bool)
         return pygame.key.get_pressed()
 
     def direction(self):
@@ -176,6 +258,8 @@ class Window:
 
     def press(self):
         """Return bool value for clicking on screen."""
+        if self.headless:
+            return defaultdict(bool)
         return pygame.key.get_pressed()
 
     # Time related functions
@@ -294,8 +378,9 @@ class Window:
         if not font:
             font = self.text_font
         text = " ".join(map(str, text))
-        font = pygame.font.SysFont(font, size, bold, italic)
-        surface = font.render(text, 1, color, background)
+        surface = self.text_cache.render(
+            text, font, size, color, background, bold, italic
+        )
         position = self.centerSurface(surface)
         self.screen.blit(surface, position)
         self.flip()
@@ -318,8 +403,9 @@ class Window:
             color = self.text_color
         if not font:
             font = self.text_font
-        font = pygame.font.SysFont(font, size, bold, italic)
-        surface = font.render(str(text), 1, color[:3], background)
+        surface = self.text_cache.render(
+            text, font, size, color, background, bold, italic
+        )
         if len(color) == 4:
             a = color[3]
             surface.set_alpha(a)
@@ -328,6 +414,11 @@ class Window:
 
     def setScreenMode(self, size=None):
         """Set the display for the screen to the right mode using its optional size."""
+        if self.headless:
+            if not size:
+                size = [800, 600]
+            self.screen = pygame.Surface(size)
+            return
         if not size:
             if self.fullscreen:
                 size = [self.info.current_w, self.info.current_h]
@@ -446,6 +537,7 @@ class Window:
         return tuple([s // 2 for s in self.size])
 
     size = property(getSize, doc="Size can only be read not written.")
+    raster = property(getRaster, doc="Raster can only be read not written.")
     corners = property(getCorners, doc="Corners can only be read not written.")
     width = property(getWidth, doc="Width can only be read not written.")
     height = property(getHeight, doc="Height can only be read not written.")
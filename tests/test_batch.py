@@ -0,0 +1,60 @@
+from fourier_drawing.batch import BatchFourier, findImages
+from fourier_drawing.storage import loadComponents
+
+import numpy as np
+import pytest
+import cv2
+import os
+
+
+def makeImage(path):
+    image = np.zeros((60, 80, 3), dtype=np.uint8)
+    cv2.circle(image, (40, 30), 20, (255, 255, 255), -1)
+    cv2.imwrite(str(path), image)
+    return str(path)
+
+
+def test_find_images(tmp_path):
+    for name in ["b.png", "a.jpg", "c.JPEG", "notes.txt"]:
+        (tmp_path / name).touch()
+    a, b, c = [str(tmp_path / name) for name in ["a.jpg", "b.png", "c.JPEG"]]
+    assert findImages([str(tmp_path)]) == [a, b, c]
+    assert findImages([str(tmp_path / "*.png"), a]) == [b, a]
+
+
+def test_paths(tmp_path):
+    batch = BatchFourier(str(tmp_path))
+    paths = batch.getPaths(["x/a.jpg", "x/a.png"])
+    assert paths == [str(tmp_path / "a_jpg"), str(tmp_path / "a_png")]
+    with pytest.raises(ValueError):
+        batch.getPaths(["x/a.jpg", "y/a.jpg"])
+
+
+def test_compute(tmp_path):
+    image = makeImage(tmp_path / "circle.png")
+    batch = BatchFourier(str(tmp_path / "objects"), 21, 50, improvement_time=0.1)
+    path = batch.getPath(image)
+    assert not batch.isUpToDate(image, path)
+    os.makedirs(batch.directory)
+    timings = batch.compute(image, path)
+    assert list(timings) == ["extraction", "ordering", "transform", "saving"]
+    components = loadComponents(path)
+    assert len(components["coefficients"]) == 21
+    assert components["display"].shape == (50, 2)
+    display = components["display"]
+    assert np.allclose(np.ptp(display, axis=0), 0.5, atol=0.05)  # Diameter of the circle
+    assert batch.isUpToDate(image, path)
+    os.utime(image, (os.path.getmtime(path) + 1,) * 2)
+    assert not batch.isUpToDate(image, path)
+
+
+def test_skip_up_to_date(tmp_path):
+    image = makeImage(tmp_path / "circle.png")
+    batch = BatchFourier(str(tmp_path / "objects"), 11, 20, improvement_time=0.1, workers=1)
+    path, = batch([image])
+    os.utime(path, (1e10, 1e10))
+    batch([image])
+    assert os.path.getmtime(path) == 1e10  # The file was not written again
+    batch.force = True
+    batch([image])
+    assert os.path.getmtime(path) != 1e10
@@ -0,0 +1,62 @@
+from fourier_drawing.cache import CoefficientCache
+from fourier_drawing.coefficients import CoefficientSet
+
+import numpy as np
+import pickle
+import os
+
+
+def test_keys():
+    points = [(0, 0), (1, 2)]
+    key = CoefficientCache.key(points, sample_number=5, include=True)
+    assert key == CoefficientCache.key(np.array(points), include=True, sample_number=5)
+    assert key != CoefficientCache.key(points, sample_number=6, include=True)
+    assert key != CoefficientCache.key([(0, 0), (1, 3)], sample_number=5, include=True)
+
+
+def test_cache(tmp_path):
+    cache = CoefficientCache(str(tmp_path), max_entries=3, memory_entries=1)
+    for i in range(5):
+        cache.put(str(i), CoefficientSet([0, 1], [i, 1j]))
+        os.utime(cache.getPath(str(i)), (i, i))
+    assert sorted(os.listdir(tmp_path)) == ["2", "3", "4"]
+    assert cache.get("0") is None and cache.misses == 1
+    assert cache.get("2").toDict() == {0: 2, 1: 1j}
+    assert cache.get("2").toDict() == {0: 2, 1: 1j} and cache.hits == 2
+    cache.put("5", CoefficientSet([0], [5]))
+    assert "2" in cache and "3" not in cache
+
+
+def test_cache_components(tmp_path):
+    cache = CoefficientCache(str(tmp_path), memory_entries=0)
+    components = {
+        "coefficients": CoefficientSet([-1, 0, 1], [1, 2, 3j]),
+        "drawing": [(0, 0), (1, 2)],
+        "construction": [(0, 0)] * 1000,
+        "display": np.ones((4, 2)),
+    }
+    cache.put("image", components)
+    loaded = cache.get("image")
+    assert loaded["coefficients"].toDict() == {-1: 1, 0: 2, 1: 3j}
+    assert loaded["drawing"] == [(0, 0), (1, 2)] and loaded["construction"] == []
+    assert np.array_equal(loaded["display"], np.ones((4, 2)))
+    with open(cache.getPath("legacy"), "wb") as f:
+        pickle.dump(components, f)
+    assert cache.get("legacy") is None  # The pickled entries are never loaded
+
+
+def test_cache_copies(tmp_path):
+    cache = CoefficientCache(str(tmp_path))
+    components = {
+        "coefficients": CoefficientSet([0, 1], [1, 2]),
+        "drawing": [(0, 0), (1, 2)],
+        "construction": [],
+        "display": [(0, 0)],
+    }
+    cache.put("image", components)
+    components["display"].append((1, 1))
+    components["coefficients"].coefficients[0] = 5
+    loaded = cache.get("image")
+    assert loaded["display"] == [(0, 0)] and loaded["coefficients"][0] == 1
+    loaded["drawing"].append((3, 3))
+    assert cache.get("image")["drawing"] == [(0, 0), (1, 2)]
@@ -0,0 +1,30 @@
+from fourier_drawing.capture import CaptureSource
+
+import numpy as np
+import time
+import cv2
+
+
+def makeVideo(path, frames=5):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 50, (32, 24))
+    for i in range(frames):
+        writer.write(np.full((24, 32, 3), 50 * i, dtype=np.uint8))
+    writer.release()
+
+
+def test_capture_source(tmp_path):
+    path = str(tmp_path / "video.avi")
+    makeVideo(path)
+    source = CaptureSource(path)
+    assert source.period == 1 / 50
+    end = time.perf_counter() + 5
+    while source.read()[0] < 8 and time.perf_counter() < end:
+        time.sleep(0.01)
+    count, frame = source.read()
+    assert count >= 8 and frame.shape == (24, 32, 3)  # The video is looped
+    source.release()
+    assert not source.isOpened()
+    source = CaptureSource(path, loop=False)
+    source.thread.join(5)
+    assert source.read()[0] == 5 and not source.isOpened()
+    source.release()
@@ -0,0 +1,27 @@
+from fourier_drawing.contours import ContourExtractor
+
+import numpy as np
+import cv2
+
+
+def test_extract_circle():
+    image = np.zeros((200, 400, 3), dtype=np.uint8)
+    cv2.circle(image, (200, 100), 50, (255, 255, 255), -1)
+    contours = ContourExtractor(min_length=50)(image)
+    assert len(contours) >= 1
+    contour = contours[0]
+    assert contour.ndim == 2 and contour.shape[1] == 2
+    # The image is 1 wide in the plane and centered on the origin
+    radii = np.hypot(contour[:, 0], contour[:, 1])
+    assert np.all(np.abs(radii - 50 / 400) < 0.01)
+
+
+def test_filter_short_contours():
+    image = np.zeros((100, 100), dtype=np.uint8)
+    cv2.rectangle(image, (10, 10), (14, 14), 255, -1)
+    cv2.rectangle(image, (40, 40), (90, 90), 255, -1)
+    contours = ContourExtractor(blur=0, min_length=100)(image)
+    assert len(contours) >= 1
+    for contour in contours:
+        assert np.ptp(contour[:, 0]) > 0.4
+    assert ContourExtractor(blur=0, min_area=10 ** 6)(image) == []
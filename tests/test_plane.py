@@ -0,0 +1,50 @@
+from fourier_drawing.window import Window
+from fourier_drawing.draw import Draw
+from fourier_drawing.plane import Plane
+
+from types import SimpleNamespace
+import pygame
+import numpy as np
+
+
+def test_screen_conversions():
+    plane = Plane(view=[[0.5, -2], [40, 30]])
+    window = SimpleNamespace(size=(800, 600))
+    positions = np.random.default_rng(0).uniform(-20, 20, (100, 2))
+    screen = plane.getAllToScreen(positions, window)
+    expected = [plane.getToScreen(p, window) for p in positions]
+    assert screen.shape == (100, 2) and np.array_equal(screen, expected)
+    out = np.zeros((100, 2), dtype=int)
+    assert plane.getAllToScreen(positions, window, out) is out
+    back = plane.getAllFromScreen(positions, window)
+    assert np.allclose(back, [plane.getFromScreen(p, window) for p in positions])
+    assert np.allclose(plane.getAllToScreen(back, window), positions.astype(int), atol=1)
+    assert plane.getAllToScreen([], window).shape == (0, 2)
+
+
+def test_grid_layer():
+    plane = Plane(theme={"grid color": (40, 40, 40)}, view=[[0, 0], [37, 37]])
+    window = SimpleNamespace(size=(300, 200), screen=pygame.Surface((300, 200)))
+    plane.showGrids(window)
+    layer = plane.grid_layer
+    for position in [[0.3, -0.1], [0.5, 0.7], [-20, 0], [-19.9, 0.05]]:
+        plane.position = position
+        plane.showGrids(window)
+        fresh = Plane(theme=plane.theme, view=[position, plane.units])
+        fresh.showGrids(window)
+        assert pygame.image.tobytes(layer.surface, "RGB") == pygame.image.tobytes(
+            fresh.grid_layer.surface, "RGB"
+        )
+    assert layer.builds == 2 and layer.scrolls == 3
+    plane.zoom([2, 2])
+    plane.showGrids(window)
+    assert layer.builds == 3
+
+
+def test_draw_shows_grid_layer():
+    window = Window("grid", size=(100, 80), headless=True)
+    draw = Draw(Plane(), window)
+    draw.show()
+    draw.plane.position = [0.1, 0]
+    draw.show()
+    assert draw.plane.grid_layer.builds == 1 and draw.plane.grid_layer.scrolls == 1
@@ -0,0 +1,32 @@
+from fourier_drawing.recorder import VideoRecorder
+
+import numpy as np
+import cv2
+
+
+def test_recorder(tmp_path):
+    path = str(tmp_path / "video.avi")
+    conversion = lambda frame: cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+    recorder = VideoRecorder(path, "MJPG", 10, (32, 24), buffers=2, conversion=conversion)
+    for i in range(20):
+        recorder.write(np.full((24, 32, 3), 10 * i, dtype=np.uint8))
+    recorder.write(np.zeros((32, 24, 3), dtype=np.uint8))  # Wrong shape
+    recorder.release()
+    recorder.release()
+    assert recorder.written + recorder.dropped == 21 and recorder.depth == 0
+    assert recorder.max_depth <= 2
+    capture = cv2.VideoCapture(path)
+    frames = 0
+    while capture.read()[0]:
+        frames += 1
+    assert frames == recorder.written > 0
+
+
+def test_dropped_frames(tmp_path):
+    recorder = VideoRecorder(str(tmp_path / "video.avi"), "MJPG", 10, (32, 24), buffers=1)
+    i, buffer = recorder.acquire()
+    assert buffer.shape == (24, 32, 3)
+    assert recorder.acquire() is None and recorder.dropped == 1
+    recorder.submit(i)
+    recorder.release()
+    assert recorder.written == 1
@@ -0,0 +1,57 @@
+from fourier_drawing.render import VideoRenderer
+from fourier_drawing.storage import saveComponents
+from fourier_drawing.coefficients import CoefficientSet
+
+import numpy as np
+import pytest
+import cv2
+
+
+def makeFile(directory):
+    cfs = CoefficientSet(np.arange(-2, 3), np.array([0.1j, 0.2, 0, 1, 0.3]))
+    drawing = [(0, 0), (1, 0), (1, 1)]
+    saveComponents(str(directory / "object"), {
+        "coefficients": cfs,
+        "drawing": drawing,
+        "construction": [],
+        "display": np.zeros((0, 2)),
+    })
+
+
+def test_split():
+    renderer = VideoRenderer(workers=2)
+    assert renderer.split(10, 3) == [(0, 3), (3, 6), (6, 10)]
+    assert renderer.split(2, 4) == [(0, 1), (1, 2)]
+
+
+def test_seek(tmp_path):
+    makeFile(tmp_path)
+    renderer = VideoRenderer(str(tmp_path), size=(64, 48), max_step=20)
+    fourier = renderer.createFourier("object")
+    for step in range(12):
+        fourier.main()
+    sought = renderer.createFourier("object")
+    sought.seek(11)
+    sought.main()
+    assert sought.step == fourier.step == 12
+    assert np.allclose(sought.display, fourier.display)
+
+
+def test_render(tmp_path):
+    makeFile(tmp_path)
+    renderer = VideoRenderer(str(tmp_path), size=(64, 48), max_step=9, workers=2, chunks=3)
+    output = renderer("object", str(tmp_path / "video.avi"))
+    capture = cv2.VideoCapture(output)
+    frames = 0
+    while capture.read()[0]:
+        frames += 1
+    assert frames == 10
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["object", "video.avi"]
+
+
+def test_unavailable_codec(tmp_path):
+    makeFile(tmp_path)
+    renderer = VideoRenderer(str(tmp_path), size=(64, 48), max_step=3, workers=1)
+    renderer.chunk_fourcc = "ZZZZ"
+    with pytest.raises(OSError, match="ZZZZ"):
+        renderer("object", str(tmp_path / "video.avi"))
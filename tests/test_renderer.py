@@ -0,0 +1,71 @@
+from fourier_drawing.renderer import EpicycleRenderer, TrailRenderer
+from fourier_drawing.plane import Plane
+
+from types import SimpleNamespace
+import numpy as np
+import pygame
+
+
+def makeContext():
+    window = SimpleNamespace(size=(200, 200))
+    plane = Plane(view=[[0, 0], [40, 40]])
+    screen = pygame.Surface(window.size)
+    return SimpleNamespace(draw=SimpleNamespace(plane=plane, window=window), screen=screen)
+
+
+def test_arrowheads():
+    renderer = EpicycleRenderer(arrow=(0.5, np.pi / 2))
+    left, right = renderer.getArrowheads(np.array([[0.0, 0.0]]), np.array([[2.0, 0.0]]))
+    assert np.allclose(left, [[2, -1]]) and np.allclose(right, [[2, 1]])
+
+
+def test_drawing():
+    context = makeContext()
+    joints = [(0, 0), (1, 0), (1, 1)]
+    renderer = EpicycleRenderer(arrows=False)
+    renderer.drawVectors(context, joints, (255, 255, 255))
+    without = pygame.mask.from_threshold(context.screen, (255, 255, 255), (1, 1, 1, 255))
+    renderer.arrows = True
+    renderer.drawVectors(context, joints, (255, 255, 255))
+    mask = pygame.mask.from_threshold(context.screen, (255, 255, 255), (1, 1, 1, 255))
+    assert mask.count() > without.count() > 0
+    context.screen.fill((0, 0, 0))
+    renderer.drawCircles(context, joints, (255, 0, 0))
+    assert any(context.screen.get_at((x, 100))[:3] == (255, 0, 0) for x in range(138, 142))
+    assert context.screen.get_at((120, 110))[:3] == (0, 0, 0)
+
+
+def test_level_of_detail():
+    context = makeContext()
+    renderer = EpicycleRenderer(threshold=2)
+    renderer.update(context)
+    joints = np.array([(0, 0), (1, 0), (1, 0.01), (10, 0), (10, 1)])
+    lengths, large, visible = renderer.getLevelOfDetail(joints)
+    assert large.tolist() == [True, False, True, True]
+    assert visible.tolist() == [True, False, True, False]
+    context.draw.plane.zoom([100, 100])
+    renderer.update(context)
+    assert renderer.getLevelOfDetail(joints)[1].all()
+
+
+def test_trail():
+    context = makeContext()
+    trail = TrailRenderer()
+    rng = np.random.default_rng(0)
+    graph = []
+    for point in rng.uniform(-2, 2, (50, 2)).tolist():
+        graph.append(tuple(point))
+        context.screen.fill((0, 0, 0))
+        trail.draw(context, graph, (255, 0, 0))
+    surface = trail.surface
+    expected = pygame.Surface(context.screen.get_size())
+    screen = context.draw.plane.getAllToScreen(graph, context.draw.window)
+    pygame.draw.lines(expected, (255, 0, 0), False, screen)
+    assert pygame.image.tobytes(context.screen, "RGB") == pygame.image.tobytes(
+        expected, "RGB"
+    )
+    trail.draw(context, graph, (255, 0, 0))
+    assert trail.surface is surface
+    context.draw.plane.zoom([2, 2])
+    trail.draw(context, graph, (255, 0, 0))
+    assert trail.surface is not surface
@@ -0,0 +1,75 @@
+from fourier_drawing.storage import (
+    ComponentsFile,
+    saveComponents,
+    loadComponents,
+    writeCoefficients,
+    readCoefficients,
+)
+from fourier_drawing.coefficients import CoefficientSet
+
+import numpy as np
+import pickle
+
+
+def makeDictionary():
+    cfs = CoefficientSet(np.arange(-3, 4), np.arange(7) * (1 + 2j))
+    return {
+        "coefficients": cfs,
+        "drawing": [(0.0, 1.0), (2.0, 3.0), (4.0, 5.0)],
+        "construction": [],
+        "display": np.arange(10, dtype=float).reshape(5, 2),
+    }
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "object")
+    dictionary = makeDictionary()
+    saveComponents(path, dictionary)
+    assert ComponentsFile.isComponentsFile(path)
+    loaded = loadComponents(path)
+    assert loaded["coefficients"].toDict() == dictionary["coefficients"].toDict()
+    assert loaded["drawing"] == dictionary["drawing"]
+    assert loaded["construction"] == []
+    display = loaded["display"]
+    assert isinstance(display, np.memmap) and not display.flags.writeable
+    assert np.array_equal(display, dictionary["display"])
+
+
+def test_sections(tmp_path):
+    path = str(tmp_path / "sections")
+    ComponentsFile.write(path, {"a": np.arange(3), "b": np.zeros((0, 2))}, name="x")
+    file = ComponentsFile(path)
+    assert file.attributes == {"name": "x"}
+    assert all(s["offset"] % 64 == 0 for s in file.sections.values())
+    assert np.array_equal(file["a"], [0, 1, 2]) and file["b"].shape == (0, 2)
+
+
+def test_migration(tmp_path):
+    path = str(tmp_path / "legacy")
+    dictionary = makeDictionary()
+    dictionary["coefficients"] = dictionary["coefficients"].toDict()
+    dictionary["display"] = [tuple(p) for p in dictionary["display"].tolist()]
+    with open(path, "wb") as f:
+        pickle.dump(dictionary, f)
+    assert not ComponentsFile.isComponentsFile(path)
+    assert loadComponents(path)["coefficients"] == dictionary["coefficients"]
+    assert ComponentsFile.isComponentsFile(path)
+    assert loadComponents(path)["coefficients"].toDict() == dictionary["coefficients"]
+
+
+def test_migration_of_empty_coefficients(tmp_path):
+    path = str(tmp_path / "legacy")
+    dictionary = {"coefficients": [], "drawing": [], "construction": [], "display": []}
+    with open(path, "wb") as f:
+        pickle.dump(dictionary, f)
+    assert loadComponents(path) == dictionary
+    loaded = loadComponents(path)
+    assert len(loaded["coefficients"]) == 0 and loaded["drawing"] == []
+    assert loaded["display"].shape == (0, 2)
+
+
+def test_text(tmp_path):
+    path = str(tmp_path / "coefficients.txt")
+    cfs = makeDictionary()["coefficients"]
+    writeCoefficients(path, cfs)
+    assert readCoefficients(path).toDict() == cfs.toDict()
@@ -0,0 +1,41 @@
+from fourier_drawing.stream import Stage, StreamFourier
+from fourier_drawing.context import Context
+
+import numpy as np
+import queue
+import cv2
+
+
+def test_stage():
+    output = queue.Queue(2)
+    values = iter(range(5))
+    stage = Stage("numbers", lambda: next(values, None), output=output)
+    stage.run()
+    assert stage.count == 5 and stage.dropped == 4
+    assert output.get_nowait()[1] == 4 and output.get_nowait() is Stage.end
+    input, output = queue.Queue(10), queue.Queue(10)
+    double = Stage("double", lambda x: 2 * x if x else None, input, output)
+    for i in range(3):
+        input.put((0, i))
+    input.put(Stage.end)
+    double.run()
+    assert [output.get_nowait()[1] for i in range(2)] == [2, 4]
+    assert double.count == 3 and double.latency >= 0
+
+
+def test_stream(tmp_path):
+    path = str(tmp_path / "video.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 60, (64, 48))
+    for i in range(15):
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        cv2.circle(frame, (20 + i, 24), 12, (255, 255, 255), -1)
+        writer.write(frame)
+    writer.release()
+    context = Context(size=(100, 80), headless=True)
+    # The queues hold all the frames so that none is dropped however slow the stages are
+    stream = StreamFourier(context, path, coefficients_number=21, queue_size=20)
+    report = stream()
+    assert stream.rendered > 0 and stream.current is not None
+    assert len(stream.current[0]) == 21
+    assert report.splitlines()[0].startswith("capture: ")
+    assert all(stage.count == 15 for stage in stream.stages)
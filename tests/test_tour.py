@@ -0,0 +1,36 @@
+from fourier_drawing.tour import Grid, TourBuilder
+
+import numpy as np
+
+
+def test_grid_nearest():
+    points = np.random.rand(500, 2)
+    grid = Grid(points)
+    for i in range(100):
+        point = np.random.rand(2) * 2 - 0.5
+        distances = np.hypot(*(points - point).T)
+        distances[~grid.alive] = np.inf
+        assert grid.nearest(point) == np.argmin(distances)
+        grid.remove(int(np.argmin(distances)))
+    assert grid.remaining == 400
+
+
+def test_chain_contours():
+    contours = [
+        np.array([[0, 0], [1, 0], [2, 0]]),
+        np.array([[5, 1], [4, 1], [3, 1], [2.5, 1]]),
+        np.array([[2.2, 5]]),
+    ]
+    tour = TourBuilder().chain(contours)
+    assert tour.tolist() == [
+        [5, 1], [4, 1], [3, 1], [2.5, 1], [2, 0], [1, 0], [0, 0], [2.2, 5]
+    ]
+
+
+def test_improve_tour():
+    builder = TourBuilder()
+    points = np.random.rand(2000, 2)
+    tour = builder.order(points)
+    improved = builder.improve(tour, 0.5)
+    assert builder.length(improved) <= builder.length(tour)
+    assert sorted(map(tuple, improved.tolist())) == sorted(map(tuple, points.tolist()))
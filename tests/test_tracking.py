@@ -0,0 +1,47 @@
+from fourier_drawing.tracking import CoefficientTracker
+from fourier_drawing.transform import Fourier
+
+import numpy as np
+
+
+def flower(phase=0, start=0, backwards=False, npts=400):
+    """Return a closed contour of 3 petals starting at the point 'start'."""
+    t = np.arange(npts) / npts
+    z = (1 + 0.3 * np.cos(6 * np.pi * t + phase)) * np.exp(2j * np.pi * t)
+    z = np.roll(z, start)
+    if backwards:
+        z = z[::-1]
+    return np.stack((z.real, z.imag), axis=1)
+
+
+def test_align():
+    tracker = CoefficientTracker(41)
+    reference = Fourier.polygonTransform(flower(), 41)
+    cfs = Fourier.polygonTransform(flower(start=137, backwards=True), 41)
+    assert tracker.distance(cfs, reference) > 1
+    aligned = tracker.align(cfs, reference)
+    assert tracker.distance(aligned, reference) < 0.01
+    shifted = tracker.shift(reference, 0.25)
+    assert tracker.distance(tracker.align(shifted, reference), reference) < 1e-9
+
+
+def test_update_reuses_and_aligns():
+    tracker = CoefficientTracker(41)
+    first = tracker.update(flower())
+    assert tracker.update(flower(0.001, start=50)) is first
+    second = tracker.update(flower(0.5, start=200, backwards=True))
+    assert second is not first and tracker.distance(second, first) < 0.2
+    assert (tracker.keyframes, tracker.reused) == (2, 1)
+
+
+def test_track():
+    tracker = CoefficientTracker(21)
+    contours = [flower(0.1 * i, start=31 * i, backwards=i % 2) for i in range(8)]
+    tracked = tracker.track(contours, interval=3)
+    assert len(tracked) == 8
+    assert tracker.keyframes + tracker.reused == 4  # Frames 0, 3, 6 and 7
+    middle = tracker.interpolate(tracked[0], tracked[3], 1 / 3)
+    assert np.allclose(np.asarray(tracked[1]), np.asarray(middle))
+    for cfs1, cfs2 in zip(tracked, tracked[1:]):
+        assert tracker.distance(cfs2, cfs1) < 0.1
+    assert tracker.track([]) == []
@@ -0,0 +1,194 @@
+from fourier_drawing.coefficients import CoefficientSet
+from fourier_drawing.transform import Fourier, EpicycleFrames, EpicycleIntegrator
+
+import numpy as np
+import cmath
+import math
+import random
+
+
+def naiveTransform(pts, ncfs, wo=2 * math.pi):
+    """Reference implementation of the fourier transform."""
+    npts = len(pts)
+    h = ncfs // 2
+    cfs = {}
+    for n in range(-h, h + 1):
+        cn = 0
+        for iw in range(npts):
+            cn += complex(*pts[iw]) * cmath.exp(-1j * n * iw / npts * wo)
+        cfs[n] = cn / npts
+    return cfs
+
+
+def randomPoints(n):
+    return [(random.uniform(-1, 1), random.uniform(-1, 1)) for i in range(n)]
+
+
+def assertClose(cfs1, cfs2, e=1e-9):
+    assert list(cfs1) == list(cfs2)
+    for n in cfs1:
+        assert abs(cfs1[n] - cfs2[n]) < e
+
+
+def test_transform_same_as_naive():
+    for npts in [1, 2, 7, 16, 33]:
+        pts = randomPoints(npts)
+        assertClose(Fourier.transform(pts, npts), naiveTransform(pts, npts))
+
+
+def test_transform_truncates():
+    pts = randomPoints(40)
+    assertClose(Fourier.transform(pts, 11), naiveTransform(pts, 11))
+
+
+def test_transform_pads():
+    pts = randomPoints(10)
+    cfs = Fourier.transform(pts, 31)
+    assert len(cfs) == 31
+    assertClose({n: cfs[n] for n in range(-5, 6)}, naiveTransform(pts, 10))
+    assert all(cfs[n] == 0 for n in cfs if abs(n) > 5)
+
+
+def test_direct_transform_with_other_pulsation():
+    pts = randomPoints(12)
+    assertClose(Fourier.transform(pts, 9, wo=3), naiveTransform(pts, 9, wo=3))
+
+
+def naiveInverseTransform(cfs, t, wo=2 * math.pi):
+    """Reference implementation of the fourier inverse transform."""
+    pts = []
+    for ti in t:
+        zpt = sum(cn * cmath.exp(1j * wo * n * ti) for n, cn in cfs.items())
+        pts.append((zpt.real, zpt.imag))
+    return pts
+
+
+def assertPointsClose(pts1, pts2, e=1e-9):
+    assert len(pts1) == len(pts2)
+    for p1, p2 in zip(pts1, pts2):
+        assert abs(p1[0] - p2[0]) < e and abs(p1[1] - p2[1]) < e
+
+
+def test_inverse_transform_same_as_naive():
+    cfs = Fourier.transform(randomPoints(21), 21)
+    for npts in [5, 21, 64]:
+        pts = Fourier.inverseTransform(cfs, npts)
+        assert pts.shape == (npts, 2) and pts.flags["C_CONTIGUOUS"]
+        t = [i / npts for i in range(npts)]
+        assertPointsClose(pts, naiveInverseTransform(cfs, t))
+
+
+def test_inverse_transform_with_fft():
+    cfs = Fourier.transform(randomPoints(50), 50)
+    t = [i / 30 for i in range(30)]
+    pts = Fourier.inverseTransform(cfs, 30, threshold=0)
+    assertPointsClose(pts, naiveInverseTransform(cfs, t))
+
+
+def test_inverse_transform_non_uniform():
+    cfs = Fourier.transform(randomPoints(15), 15)
+    t = sorted(random.random() for i in range(40))
+    pts = Fourier.inverseTransform(cfs, t)
+    assertPointsClose(pts, naiveInverseTransform(cfs, t))
+
+
+def test_inverse_transform_recovers_points():
+    pts = randomPoints(33)
+    cfs = Fourier.transform(pts, 33)
+    assertPointsClose(Fourier.inverseTransform(cfs, 33, threshold=0), pts)
+
+
+def naiveBuild(cfs, t, wo=2 * math.pi):
+    """Reference implementation of the construction graph."""
+    h = len(cfs) // 2
+    zpt = cfs[0]
+    cst = [(0, 0), (zpt.real, zpt.imag)]
+    for n in range(1, h + 1):
+        for m in [n, -n]:
+            zpt += cfs[m] * cmath.exp(1j * wo * m * t)
+            cst.append((zpt.real, zpt.imag))
+    return cst
+
+
+def test_build_frames_same_as_naive():
+    cfs = Fourier.transform(randomPoints(9), 9)
+    t = [i / 7 for i in range(8)]
+    frames = Fourier.buildFrames(cfs, t)
+    assert frames.shape == (8, 10, 2)
+    for i in range(8):
+        assertPointsClose(frames[i], naiveBuild(cfs, t[i]))
+
+
+def test_epicycle_frames_by_chunks():
+    cfs = Fourier.transform(randomPoints(11), 11)
+    frames = EpicycleFrames(cfs, 50, 49)
+    chunked = EpicycleFrames(cfs, 50, 49, chunk=7)
+    for i in [0, 13, 49, 3, 48]:
+        assertPointsClose(chunked[i], frames[i])
+    assert len(chunked.cache) <= chunked.blocks
+
+
+def test_epicycle_integrator_same_as_frames():
+    cfs = Fourier.transform(randomPoints(15), 15)
+    frames = EpicycleFrames(cfs, 300, 299)
+    integrator = EpicycleIntegrator(cfs, 300, 299, renormalization=64)
+    for i in list(range(300)) + [10, 11, 5, 299]:
+        assertPointsClose(integrator[i], frames[i], e=1e-9)
+
+
+def test_coefficient_set():
+    cfs = {n: complex(n, -n) for n in [3, -2, 0, 7]}
+    cs = CoefficientSet.create(cfs)
+    assert list(cs) == [-2, 0, 3, 7]
+    assert cs == cfs and cs[3] == 3 - 3j and 7 in cs and 1 not in cs
+    assert list(cs[0:7]) == [0, 3]
+    assert np.shares_memory(np.asarray(cs), cs.coefficients)
+    cs = Fourier.transform(randomPoints(9), 9)
+    assert isinstance(cs, CoefficientSet) and cs.contiguous
+    assert cs[-4] == cs.coefficients[0] and list(cs) == list(range(-4, 5))
+    for s in [cs, CoefficientSet.create(cfs)]:  # Contiguous or not
+        assert s[3.0] == s[3] and s.get(np.int64(3)) == s[3]
+        assert "a" not in s and s.get(1.5) is None
+        assert s.get(None) is None and 10 ** 20 not in s
+
+
+def samplePolygon(pts, durations, k):
+    """Sample k*durations[i] points on the segment i of the closed polygon."""
+    sample = []
+    for i in range(len(pts)):
+        a, b = complex(*pts[i]), complex(*pts[(i + 1) % len(pts)])
+        m = k * durations[i]
+        sample += [a + (b - a) * j / m for j in range(m)]
+    return np.array(sample)
+
+
+def test_polygon_transform_same_as_sampled_polygon():
+    pts = randomPoints(6)
+    cfs = Fourier.polygonTransform(pts, 21)
+    assert isinstance(cfs, CoefficientSet) and len(cfs) == 21
+    # The riemann sum is close to the exact integral
+    sample = samplePolygon(pts, [1] * 6, 2000)
+    assertClose(cfs, Fourier.transform(sample, 21), e=1e-3)
+    durations = [1, 2, 1, 1, 3, 1]
+    cfs = Fourier.polygonTransform(pts, 21, durations=durations)
+    sample = samplePolygon(pts, durations, 1000)
+    assertClose(cfs, Fourier.transform(sample, 21), e=1e-3)
+
+
+def test_truncate():
+    pts = randomPoints(64)
+    cfs = Fourier.transform(pts, 63)
+    truncated, report = Fourier.truncate(cfs, count=10)
+    assert len(truncated) == report["count"] == 10
+    assert min(abs(c) for c in truncated.values()) >= max(
+        abs(cfs[n]) for n in cfs if n not in truncated
+    )
+    truncated, report = Fourier.truncate(cfs, energy=0.9)
+    assert report["energy"] >= 0.9
+    assert Fourier.truncate(cfs, energy=0.9, count=report["count"] - 1)[1]["energy"] < 0.9
+    truncated, report = Fourier.truncate(cfs, error=0.5)
+    assert report["max"] <= 0.5
+    t = np.arange(200) / 200
+    difference = Fourier.evaluate(cfs, t) - Fourier.evaluate(truncated, t)
+    assert np.max(np.hypot(*difference.T)) <= report["max"] + 1e-9
+    assert Fourier.truncate(cfs, error=0)[1]["count"] <= len(cfs)
@@ -0,0 +1,87 @@
+from fourier_drawing.context import Context
+from fourier_drawing.fourier import VisualFourier
+from fourier_drawing.coefficients import CoefficientSet
+from fourier_drawing.storage import saveComponents
+
+import numpy as np
+
+
+def createFourier(tmp_path):
+    context = Context(size=(64, 48), headless=True)
+    fourier = VisualFourier(context, directory=str(tmp_path))
+    fourier.drawing = [(0, 0), (1, 0), (1, 1), (0, 1)]
+    fourier.updateSample()
+    return fourier
+
+
+def test_background_transform(tmp_path):
+    fourier = createFourier(tmp_path)
+    fourier.setMode(1)
+    assert fourier.transforming and fourier.mode == 1
+    fourier.nextMode()  # The display mode waits for the coefficients
+    assert fourier.transforming and fourier.mode == 1
+    fourier.show()  # The window is shown while the coefficients are computed
+    fourier.waitTransform()
+    assert not fourier.transforming and len(fourier.frames) == fourier.max_step + 1
+    expected = fourier.transform()
+    assert np.allclose(np.asarray(fourier.coefficients), np.asarray(expected))
+    fourier.setMode(0)
+    fourier.setMode(1)  # The coefficients are now cached
+    assert not fourier.transforming
+
+
+def test_superseded_transform(tmp_path):
+    fourier = createFourier(tmp_path)
+    fourier.setMode(1)
+    job, start = fourier.job, fourier.job_start
+    fourier.drawing.append((0.5, 2))
+    fourier.updateSample()
+    assert fourier.job is not job and fourier.job_id == 3
+    assert fourier.job_start == start  # The progress goes on from the first job
+    fourier.waitTransform()
+    assert len(fourier.coefficients) == len(fourier.sample)
+    assert np.allclose(np.asarray(fourier.coefficients), np.asarray(fourier.transform()))
+
+
+def test_cancel_transform(tmp_path):
+    fourier = createFourier(tmp_path)
+    fourier.setMode(1)
+    fourier.cancelTransform()
+    assert fourier.mode == 0 and not fourier.transforming
+    assert str(fourier.context.console[-1]) == "The transform is cancelled."
+
+
+def test_animate_loaded_file(tmp_path):
+    cfs = CoefficientSet(np.arange(-2, 3), np.array([0.1j, 0.2, 0, 1, 0.3]))
+    drawing = [(np.cos(a), np.sin(a)) for a in np.linspace(0, 6, 300)]
+    saveComponents(str(tmp_path / "object"), {
+        "coefficients": cfs,
+        "drawing": drawing,
+        "construction": [],
+        "display": np.zeros((0, 2)),
+    })
+    context = Context(size=(64, 48), headless=True)
+    fourier = VisualFourier(context, directory=str(tmp_path), filename="object")
+    fourier.load()
+    fourier.max_step = 10
+    assert fourier.animate() == 12  # The last frame switches to the display mode
+    assert len(fourier.coefficients) == 5 and fourier.mode == 2
+
+
+def test_shutdown(tmp_path):
+    fourier = createFourier(tmp_path)
+    fourier.setMode(1)
+    job = fourier.job
+    fourier.shutdown()
+    assert fourier.executor is None and not fourier.transforming
+    assert job.cancelled() or job.exception() is None
+
+
+def test_transform_settings_captured(tmp_path):
+    fourier = createFourier(tmp_path)
+    fourier.truncation = {"count": 3}
+    fourier.setMode(1)
+    fourier.truncation["count"] = 1  # Changed after the submission
+    fourier.transform_mode = "polygon"
+    fourier.waitTransform()
+    assert len(fourier.coefficients) == 3
@@ -0,0 +1,31 @@
+from fourier_drawing.window import TextCache, Window
+
+import pygame
+
+
+def test_text_cache():
+    cache = TextCache(max_surfaces=2)
+    a = cache.render("Time: 0", "monospace", 20, (255, 255, 255))
+    assert cache.render("Time: 0", "monospace", 20, (255.0, 255.0, 255.0)) is a
+    assert cache.hits == 1 and cache.misses == 1
+    cache.render("Time: 1", "monospace", 20, (255, 255, 255))
+    cache.render("Pause", "monospace", 20, (255, 0, 0))
+    assert cache.font_misses == 1 and cache.font_hits == 2
+    assert cache.render("Time: 0", "monospace", 20, (255, 255, 255)) is not a
+    assert cache.misses == 4 and len(cache.surfaces) == 2
+    cache.render("Pause", "monospace", 20, (255, 0, 0), bold=True)
+    assert cache.font_misses == 2
+    assert cache.report() == "texts: 1 hits, 5 misses, fonts: 3 hits, 2 misses"
+
+
+def test_headless_window():
+    window = Window("headless", size=(100, 80), headless=True, background_color=(0, 0, 0))
+    assert window.open and window.size == (100, 80)
+    pygame.draw.line(window.screen, (255, 0, 0), (0, 10), (99, 10))
+    window.flip()
+    raster = window.raster
+    assert raster.shape == (80, 100, 3)
+    assert raster[10, 50].tolist() == [255, 0, 0] and raster[20, 50].tolist() == [0, 0, 0]
+    assert not window.press()[pygame.K_LEFT]
+    window.check()
+    assert window.open